@@ -42,7 +42,7 @@ if ! command -v "$python_cmd" >/dev/null 2>&1; then
 fi
 
 pushd "$BINDING_DIR" >/dev/null
-if "$python_cmd" test/test_traverser.py > "$LOG_DIR/python_test.log" 2>&1; then
+if { "$python_cmd" test/test_traverser.py && "$python_cmd" test/test_setup.py; } > "$LOG_DIR/python_test.log" 2>&1; then
     info "Python binding tests passed"
 else
     warn "Python binding tests failed"
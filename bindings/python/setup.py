@@ -1,12 +1,15 @@
 # SPDX-License-Identifier: MIT
 # Copyright (c) 2025 archive_r Team
 
-import atexit
 import filecmp
+import hashlib
 import os
-import platform
 import shutil
+import subprocess
 import sys
+import sysconfig
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Iterable, List, Optional, Tuple
 
@@ -77,8 +80,9 @@ _ensure_file_copy(archive_r_root / 'NOTICE', local_notice)
 _ensure_tree_copy(archive_r_root / 'LICENSES', local_licenses_dir)
 
 local_version = binding_root / 'VERSION'
-system_name = platform.system().lower()
-is_windows = system_name == 'windows' or os.name == 'nt'
+IS_WINDOWS = sys.platform == 'win32'
+IS_DARWIN = sys.platform == 'darwin'
+IS_LINUX = sys.platform.startswith('linux')
 target_triple = os.environ.get('ARCHIVE_R_TARGET_TRIPLE')
 sysroot_override = os.environ.get('ARCHIVE_R_SYSROOT')
 bootstrap_cmd = os.environ.get('ARCHIVE_R_BOOTSTRAP_CMD')
@@ -86,12 +90,11 @@ bootstrap_prefix = os.environ.get('ARCHIVE_R_BOOTSTRAP_PREFIX')
 bootstrap_args = os.environ.get('ARCHIVE_R_BOOTSTRAP_ARGS', '')
 auto_fetch_deps = os.environ.get('ARCHIVE_R_AUTO_FETCH_DEPS', '0') == '1'
 bootstrap_scripts = []
-if system_name == 'darwin':
+if IS_DARWIN:
     bootstrap_scripts.append(binding_root / 'tools' / 'build-deps-macos.sh')
 bootstrap_scripts.append(binding_root / 'tools' / 'build-deps-manylinux.sh')
 bootstrap_script = next((p for p in bootstrap_scripts if p.exists()), None)
 force_source_build = os.environ.get('ARCHIVE_R_FORCE_SOURCE', '0') == '1'
-print(f"DEBUG: system_name={system_name}, os.name={os.name}, sys.platform={sys.platform}")
 libraries: List[str] = ['archive']
 library_dirs: List[str] = []
 include_dirs_override: List[str] = []
@@ -104,10 +107,7 @@ staged_shared_libs: List[Path] = []
 def extend_path_entries(target: List[str], raw_value: Optional[str]) -> None:
     if not raw_value:
         return
-    for entry in raw_value.split(os.pathsep):
-        normalized = entry.strip()
-        if normalized:
-            target.append(normalized)
+    target.extend(filter(None, (entry.strip() for entry in raw_value.split(os.pathsep))))
 
 
 def stage_shared_libs(paths: Iterable[Path]) -> None:
@@ -163,7 +163,7 @@ def configure_libarchive_paths_from_root(root_value: Optional[str]) -> None:
         if candidate.exists():
             library_dirs.append(str(candidate))
 
-    if not is_windows:
+    if not IS_WINDOWS:
         for candidate in lib_candidates:
             if candidate.exists():
                 runtime_library_dirs.append(str(candidate))
@@ -175,7 +175,7 @@ extend_path_entries(library_dirs, os.environ.get('LIBARCHIVE_LIBRARY_DIRS'))
 extend_path_entries(runtime_library_dirs, os.environ.get('LIBARCHIVE_RUNTIME_DIRS'))
 if sysroot_override:
     configure_libarchive_paths_from_root(sysroot_override)
-    if not is_windows:
+    if not IS_WINDOWS:
         extra_compile_args.append(f"--sysroot={sysroot_override}")
         extra_link_args.append(f"--sysroot={sysroot_override}")
 
@@ -245,23 +245,96 @@ def track_generated(path: Path, kind: str) -> None:
     generated_paths.append((path, kind))
 
 
+def copy_file_contents(source: Path, target: Path) -> None:
+    # Only the bytes are needed for packaging, so metadata is not copied.
+    if not IS_LINUX:
+        shutil.copyfile(source, target)
+        return
+
+    kernel_copies = []
+    if hasattr(os, 'copy_file_range'):
+        kernel_copies.append(lambda src_fd, dst_fd, count: os.copy_file_range(src_fd, dst_fd, count))
+    kernel_copies.append(lambda src_fd, dst_fd, count: os.sendfile(dst_fd, src_fd, None, count))
+
+    with open(source, 'rb') as src, open(target, 'wb') as dst:
+        size = os.fstat(src.fileno()).st_size
+        for kernel_copy in kernel_copies:
+            try:
+                remaining = size
+                while remaining > 0:
+                    copied = kernel_copy(src.fileno(), dst.fileno(), remaining)
+                    if copied <= 0:
+                        raise OSError(f"short copy from {source}")
+                    remaining -= copied
+                return
+            except OSError:
+                # Older kernels reject copy_file_range across filesystems; start over.
+                src.seek(0)
+                dst.seek(0)
+                dst.truncate()
+        shutil.copyfileobj(src, dst)
+
+
 def copy_file(source: Path, target: Path) -> bool:
     if not source.exists():
         return False
     target.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copy2(source, target)
+    copy_file_contents(source, target)
     track_generated(target, 'file')
     return True
 
 
+def tree_digest(root: Path) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    # Follows directory symlinks like link_tree(), so their contents are covered too.
+    for directory, dirnames, filenames in os.walk(root, followlinks=True):
+        dirnames.sort()
+        for name in sorted(filenames):
+            path = Path(directory, name)
+            if not path.is_file():
+                continue
+            stat = path.stat()
+            digest.update(f"{path.relative_to(root).as_posix()}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def link_tree(source: Path, target: Path) -> None:
+    target.mkdir(parents=True, exist_ok=True)
+    with os.scandir(source) as entries:
+        for entry in entries:
+            destination = target / entry.name
+            if entry.is_dir():
+                # Symlinked directories become real ones with their contents linked in,
+                # as copytree() did, so they still reach the sdist.
+                link_tree(Path(entry.path), destination)
+                continue
+            if not entry.is_file():
+                continue
+            try:
+                # Vendored files are never edited in place, so sharing the inode is safe
+                # and removing the link during cleanup leaves the original untouched.
+                # link() does not follow symlinks, so resolve them to the file itself.
+                os.link(os.path.realpath(entry.path), destination)
+            except OSError:
+                # Cross-device targets and filesystems without hard links get a real copy.
+                shutil.copy2(entry.path, destination)
+
+
 def copy_tree(source: Path, target: Path) -> bool:
     if not source.exists():
         return False
-    if target.exists():
-        shutil.rmtree(target)
-    target.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copytree(source, target)
+    # The stamp records the source tree's file listing, sizes and mtimes; when it
+    # still matches, the vendored copy is current and the rmtree/copytree is skipped.
+    stamp = target.parent / f".{target.name}.stamp"
+    digest = tree_digest(source)
+    up_to_date = target.exists() and stamp.exists() and stamp.read_text(encoding='utf-8') == digest
+    if not up_to_date:
+        if target.exists():
+            shutil.rmtree(target)
+        link_tree(source, target)
+        stamp.write_text(digest, encoding='utf-8')
     track_generated(target, 'dir')
+    track_generated(stamp, 'file')
     return True
 
 
@@ -285,12 +358,26 @@ def cleanup_generated() -> None:
             pass
 
 
-atexit.register(cleanup_generated)
+
+# Commands that never compile or package the core sources.
+NO_VENDOR_COMMANDS = {'egg_info', 'dist_info', 'develop', '--help', '-h', '--help-commands'}
+
+
+def vendoring_required() -> bool:
+    commands = set(sys.argv[1:])
+    if 'sdist' in commands:
+        return True
+    if commands & NO_VENDOR_COMMANDS:
+        return False
+    # resolve_core_paths() prefers the repository tree, so a vendored copy is dead weight here.
+    return not ((archive_r_root / 'include').exists() and (archive_r_root / 'src').exists())
 
 
 def prepare_distribution_assets() -> None:
     copy_file(archive_r_root / 'LICENSE', local_license)
     copy_file(archive_r_root / 'VERSION', local_version)
+    if not vendoring_required():
+        return
     copy_tree(archive_r_root / 'include', vendor_include)
     copy_tree(archive_r_root / 'src', vendor_src)
 
@@ -347,31 +434,32 @@ except ImportError:
 package_version = read_version()
 core_include_dir, core_src_dir = resolve_core_paths()
 
-sources = ['src/archive_r_py.cc']
+binding_source = 'src/archive_r_py.cc'
+sources = [binding_source]
+
+# Checked in order; the first existing file wins.
+PREBUILT_CANDIDATES = (
+    archive_r_build / 'libarchive_r_core.so',
+    archive_r_build / 'libarchive_r_core.dylib',
+    archive_r_build / 'archive_r_core.dll',
+    archive_r_build / 'libarchive_r_core.dll',
+    archive_r_build / 'archive_r_core.lib',
+    archive_r_build / 'Release' / 'archive_r_core.dll',
+    archive_r_build / 'Release' / 'archive_r_core.lib',
+)
+
 
 def find_prebuilt_shared_library() -> Optional[Path]:
     if target_triple:
         return None
-    candidates = [
-        archive_r_build / 'libarchive_r_core.so',
-        archive_r_build / 'libarchive_r_core.dylib',
-        archive_r_build / 'archive_r_core.dll',
-        archive_r_build / 'libarchive_r_core.dll',
-        archive_r_build / 'archive_r_core.lib',
-        archive_r_build / 'Release' / 'archive_r_core.dll',
-        archive_r_build / 'Release' / 'archive_r_core.lib',
-    ]
-    for candidate in candidates:
-        if candidate.exists():
-            return candidate
-    return None
+    return next((candidate for candidate in PREBUILT_CANDIDATES if candidate.exists()), None)
 
 
 prebuilt_shared = None if force_source_build else find_prebuilt_shared_library()
 if prebuilt_shared:
     libraries.append('archive_r_core')
     library_dirs.append(str(prebuilt_shared.parent))
-    if not is_windows:
+    if not IS_WINDOWS:
         runtime_library_dirs.append(str(prebuilt_shared.parent))
     stage_shared_libs([prebuilt_shared])
     print(f"Using pre-built shared archive_r library: {prebuilt_shared}")
@@ -391,8 +479,11 @@ base_include_dirs = [
 if include_dirs_override:
     base_include_dirs.extend(include_dirs_override)
 
+# Headers are tracked so that incremental builds recompile when they change.
+header_depends = sorted(str(path) for root in (core_include_dir, core_src_dir) for path in root.rglob('*.h'))
+
 library_dirs.append(str(libs_dir))
-if not is_windows:
+if not IS_WINDOWS:
     runtime_library_dirs.append(str(libs_dir))
     runtime_library_dirs.append('$ORIGIN/.libs')
     extra_link_args.append('-Wl,-rpath,$ORIGIN/.libs')
@@ -411,6 +502,128 @@ library_dirs = _dedupe(library_dirs)
 runtime_library_dirs = _dedupe(runtime_library_dirs)
 extra_link_args = _dedupe(extra_link_args)
 
+
+def env_flag(name: str, default: bool) -> bool:
+    value = os.environ.get(name, '').strip().lower()
+    if not value:
+        return default
+    return value not in ('0', 'false', 'no', 'off')
+
+
+def detect_compiler_family(compiler) -> str:
+    if compiler.compiler_type == 'msvc':
+        return 'msvc'
+    driver = (getattr(compiler, 'compiler_so', None) or ['cc'])[0]
+    try:
+        banner = subprocess.run([driver, '--version'], capture_output=True, text=True, check=False).stdout
+    except OSError:
+        banner = ''
+    # Apple ships clang as "gcc", so trust the version banner over the driver name.
+    if 'clang' in banner.lower() or 'clang' in os.path.basename(driver):
+        return 'clang'
+    return 'gcc'
+
+
+def resolve_compiler_launcher(compiler_family: str) -> Optional[str]:
+    override = os.environ.get('ARCHIVE_R_COMPILER_LAUNCHER')
+    if override is not None:
+        override = override.strip()
+        if not override or override.lower() in ('0', 'none', 'off'):
+            return None
+        return shutil.which(override) or override
+    # ccache support for cl.exe is unreliable; sccache handles MSVC well.
+    candidates = ('sccache',) if compiler_family == 'msvc' else ('ccache', 'sccache')
+    return next((found for found in map(shutil.which, candidates) if found), None)
+
+
+def resolve_fast_linker() -> Optional[str]:
+    override = os.environ.get('ARCHIVE_R_LINKER', '').strip()
+    if override:
+        return None if override.lower() in ('0', 'none', 'off', 'default') else override
+    if shutil.which('mold'):
+        return 'mold'
+    if shutil.which('ld.lld'):
+        return 'lld'
+    return None
+
+
+def resolve_build_jobs() -> int:
+    raw_value = os.environ.get('ARCHIVE_R_BUILD_JOBS', '').strip()
+    if not raw_value:
+        return os.cpu_count() or 1
+    try:
+        return max(1, int(raw_value))
+    except ValueError:
+        raise RuntimeError(f"ARCHIVE_R_BUILD_JOBS must be an integer, got {raw_value!r}") from None
+
+
+# Headers of the pybind11 binding TU that are worth parsing only once per build tree.
+BINDING_PCH_HEADER = '''// Generated by setup.py: precompiled headers for the pybind11 binding.
+#include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
+#include <iostream>
+#include <limits>
+#include <memory>
+#include <optional>
+#include <stdexcept>
+#include <string>
+#include <vector>
+'''
+
+
+# Archives from test_data/ whose traversal drives the profile-guided build.
+PGO_TRAINING_ARCHIVES = (
+    'test_perf.zip',
+    'stress_test_ultimate.tar.gz',
+    'deeply_nested.tar.gz',
+    'deeply_nested_multi_volume.tar.gz',
+)
+
+PGO_TRAINING_SCRIPT = '''
+import sys
+sys.path.insert(0, sys.argv[1])
+import archive_r
+for path in sys.argv[2:]:
+    with archive_r.Traverser([path]) as traverser:
+        for entry in traverser:
+            entry.path, entry.size, entry.is_file
+'''
+
+
+def resolve_extension_cache_dir() -> Optional[Path]:
+    raw_value = os.environ.get('ARCHIVE_R_EXTENSION_CACHE', '').strip()
+    if not raw_value or raw_value.lower() in ('0', 'false', 'no', 'off'):
+        return None
+    if raw_value.lower() in ('1', 'true', 'yes', 'on'):
+        cache_home = os.environ.get('XDG_CACHE_HOME') or str(Path.home() / '.cache')
+        return Path(cache_home) / 'archive_r'
+    return Path(raw_value).expanduser()
+
+
+def find_libarchive_header(search_dirs: Iterable[str]) -> Optional[Path]:
+    candidates = [Path(entry) / 'archive.h' for entry in search_dirs]
+    candidates.extend([Path('/usr/local/include/archive.h'), Path('/usr/include/archive.h')])
+    return next((candidate for candidate in candidates if candidate.exists()), None)
+
+
+def newest_mtime(paths: Iterable[str]) -> float:
+    return max((os.stat(path).st_mtime for path in paths if os.path.exists(path)), default=0.0)
+
+
+def program_fingerprint(command: List[str]) -> List[Tuple[str, int, int]]:
+    # Identifies the launcher/compiler programs leading the command, so that
+    # upgrading the toolchain in place is noticed like a change of flags.
+    fingerprint = []
+    for program in command:
+        if program.startswith('-'):
+            break
+        resolved = shutil.which(program)
+        if resolved:
+            st = os.stat(resolved)
+            fingerprint.append((resolved, st.st_size, st.st_mtime_ns))
+    return fingerprint
+
+
 class BuildExt(build_ext):
     def get_ext_filename(self, ext_name: str) -> str:  # type: ignore[override]
         filename = super().get_ext_filename(ext_name)
@@ -420,35 +633,365 @@ class BuildExt(build_ext):
             stem, _ = os.path.splitext(filename)
             return f"{stem}{override_suffix}"
 
-        if target_triple and not is_windows:
+        if target_triple and not IS_WINDOWS:
             stem, _ = os.path.splitext(filename)
             py_ver = f"{sys.version_info.major}{sys.version_info.minor}"
             return f"{stem}.cpython-{py_ver}-{target_triple}.so"
 
         return filename
 
+    def run(self) -> None:
+        # setuptools clears `inplace` while the extensions are compiled, so record it first.
+        self.dev_build = bool(self.inplace or getattr(self, 'editable_mode', False))
+        super().run()
+
+    def lto_enabled(self) -> bool:
+        # Release builds (wheels, `pip install .`) get LTO by default; in-place and
+        # editable builds skip it to keep the edit/compile loop short.
+        return env_flag('ARCHIVE_R_ENABLE_LTO', not getattr(self, 'dev_build', False))
+
+    def use_compiler_launcher(self, launcher: str) -> None:
+        compiler = self.compiler
+        if compiler.compiler_type == 'msvc':
+            # MSVCCompiler resolves cl.exe lazily, so wrap the compile invocations instead.
+            spawn = compiler.spawn
+
+            def launch(cmd, **kwargs):
+                if cmd and cmd[0] == getattr(compiler, 'cc', None):
+                    cmd = [launcher] + list(cmd)
+                return spawn(cmd, **kwargs)
+
+            compiler.spawn = launch
+        else:
+            # Only the compile drivers are wrapped; distutils derives the C++ link
+            # command from compiler_cxx, which must stay a plain compiler.
+            for attr in ('compiler_so', 'compiler_so_cxx'):
+                command = getattr(compiler, attr, None)
+                if command and command[0] != launcher:
+                    setattr(compiler, attr, [launcher] + list(command))
+        os.environ.setdefault('CCACHE_COMPILERCHECK', 'content')
+        print(f"Using compiler launcher: {launcher}")
+
+    def initialize_options(self) -> None:
+        super().initialize_options()
+        # Keep object files in a stable, per-interpreter location instead of the
+        # throwaway directory used by editable installs, so rebuilds can reuse them.
+        platform_tag = target_triple or sysconfig.get_platform()
+        self.build_temp = str(binding_root / 'build' / 'objects' / f"{platform_tag}-{sys.implementation.cache_tag}")
+
+    def use_incremental_compile(self, jobs: int) -> None:
+        compiler = self.compiler
+        if not getattr(compiler, 'initialized', True):
+            compiler.initialize()
+        compile_units = compiler.compile
+
+        def compile_sources(sources, output_dir=None, macros=None, include_dirs=None, debug=0,
+                            extra_preargs=None, extra_postargs=None, depends=None):
+            options = dict(output_dir=output_dir, macros=macros, include_dirs=include_dirs, debug=debug,
+                           extra_preargs=extra_preargs, extra_postargs=extra_postargs, depends=depends)
+            objects = compiler.object_filenames(sources, output_dir=output_dir)
+            # Per-source (extra arguments, extra dependencies), e.g. the binding's PCH.
+            overrides = getattr(self, 'unit_overrides', {})
+
+            # Any change to the compiler command or options invalidates every object.
+            stamp = Path(output_dir or '.') / 'compile-options.stamp'
+            signature = hashlib.sha256(repr((
+                compiler.compiler_type,
+                getattr(compiler, 'compiler_so', None),
+                sorted(options.items(), key=lambda item: item[0]),
+                sorted(overrides.items()),
+            )).encode('utf-8')).hexdigest()
+            reusable = stamp.exists() and stamp.read_text(encoding='utf-8') == signature
+            # Per-unit dependencies (the PCH) are also in the extension's depends, but
+            # only invalidate the units that list them.
+            unit_only = {path for _, unit_depends in overrides.values() for path in unit_depends}
+            headers_mtime = newest_mtime(path for path in depends or [] if path not in unit_only)
+
+            def inputs_mtime(source: str) -> float:
+                unit_depends = overrides.get(source, ([], []))[1]
+                return max(os.stat(source).st_mtime, headers_mtime, newest_mtime(unit_depends))
+
+            def compile_unit(source: str) -> None:
+                unit_args = overrides.get(source, ([], []))[0]
+                unit_options = dict(options, extra_postargs=list(extra_postargs or []) + unit_args)
+                compile_units([source], **unit_options)
+
+            stale = [
+                source
+                for source, obj in zip(sources, objects)
+                if not reusable
+                or not os.path.exists(obj)
+                or os.stat(obj).st_mtime < inputs_mtime(source)
+            ]
+            if len(stale) < len(sources):
+                print(f"Reusing {len(sources) - len(stale)} up-to-date object file(s) in {output_dir}")
+
+            if jobs > 1 and len(stale) > 1:
+                # setuptools only parallelizes across extensions and everything here is a
+                # single extension, so fan the translation units out per source instead.
+                with ThreadPoolExecutor(max_workers=min(jobs, len(stale))) as pool:
+                    list(pool.map(compile_unit, stale))
+            else:
+                for source in stale:
+                    compile_unit(source)
+
+            stamp.parent.mkdir(parents=True, exist_ok=True)
+            stamp.write_text(signature, encoding='utf-8')
+            return objects
+
+        compiler.compile = compile_sources
+
+    def links_with(self, flags: List[str], compile_args: Iterable[str] = (), link_args: Iterable[str] = ()) -> bool:
+        # The probe is built with the real compile and link options: with LTO the
+        # linker receives compiler IR, which e.g. lld cannot read from GCC.
+        with tempfile.TemporaryDirectory() as probe_dir:
+            source = Path(probe_dir) / 'probe.cc'
+            source.write_text('int main() { return 0; }\n', encoding='utf-8')
+            command = (list(self.compiler.compiler_cxx) + list(compile_args)
+                       + [str(source), '-o', str(Path(probe_dir) / 'probe')] + list(link_args) + flags)
+            try:
+                return subprocess.run(command, capture_output=True, check=False).returncode == 0
+            except OSError:
+                return False
+
+    def fast_linker_flags(self, linker: str, jobs: int, compile_args: Iterable[str] = (),
+                          link_args: Iterable[str] = ()) -> List[str]:
+        # lld takes --threads=N, mold and gold spell it --thread-count=N; older GCC
+        # drivers may not know -fuse-ld=mold at all, so probe before committing.
+        candidates = [
+            [f"-fuse-ld={linker}", f"-Wl,--threads={jobs}"],
+            [f"-fuse-ld={linker}", '-Wl,--threads', f"-Wl,--thread-count={jobs}"],
+            [f"-fuse-ld={linker}"],
+        ]
+        compile_args, link_args = list(compile_args), list(link_args)
+        return next((flags for flags in candidates if self.links_with(flags, compile_args, link_args)), [])
+
+    def prepare_binding_pch(self, ext: Extension, compiler_family: str) -> Tuple[List[str], List[str]]:
+        # Returns (compile arguments, dependencies) for the unit that consumes the PCH.
+        pch_dir = Path(self.build_temp) / 'pch'
+        header = pch_dir / 'archive_r_binding_pch.h'
+        # clang's driver picks up <header>.pch for -include, GCC looks for <header>.gch.
+        compiled = header.with_name(header.name + ('.pch' if compiler_family == 'clang' else '.gch'))
+        pch_dir.mkdir(parents=True, exist_ok=True)
+        if not header.exists() or header.read_text(encoding='utf-8') != BINDING_PCH_HEADER:
+            header.write_text(BINDING_PCH_HEADER, encoding='utf-8')
+
+        # The PCH must be built with the same driver, macros, include order and flags
+        # as the translation unit that consumes it.
+        command = list(getattr(self.compiler, 'compiler_so_cxx', None) or self.compiler.compiler_so)
+        for macro in ext.define_macros or []:
+            command.append(f"-D{macro[0]}" if macro[1] is None else f"-D{macro[0]}={macro[1]}")
+        command.extend(f"-I{entry}" for entry in list(ext.include_dirs or []) + list(self.compiler.include_dirs or []))
+        command.extend(ext.extra_compile_args or [])
+        command.extend(['-x', 'c++-header', str(header), '-o', str(compiled)])
+
+        stamp = pch_dir / 'pch.stamp'
+        signature = hashlib.sha256(repr((
+            command,
+            program_fingerprint(command),
+            pybind11.__version__,
+            BINDING_PCH_HEADER,
+        )).encode('utf-8')).hexdigest()
+        if not (compiled.exists() and stamp.exists() and stamp.read_text(encoding='utf-8') == signature):
+            try:
+                # Newer setuptools deprecates spawn() in favor of call().
+                getattr(self.compiler, 'call', self.compiler.spawn)(command)
+            except Exception as exc:
+                print(f"Warning: precompiled header build failed, compiling without it: {exc}", file=sys.stderr)
+                return [], []
+            stamp.write_text(signature, encoding='utf-8')
+        os.environ.setdefault('CCACHE_SLOPPINESS', 'pch_defines,time_macros')
+        # Depending on the compiled PCH as well rebuilds the unit whenever it is regenerated.
+        return ['-include', str(header), '-Winvalid-pch'], [str(header), str(compiled)]
+
+    def extension_cache_key(self, ext: Extension) -> str:
+        digest = hashlib.blake2b(digest_size=20)
+        # Everything that influences the produced binary: toolchain, options, the
+        # libarchive headers being compiled against, and the sources themselves.
+        digest.update(repr((
+            sys.implementation.cache_tag,
+            sysconfig.get_platform(),
+            target_triple,
+            self.compiler.compiler_type,
+            getattr(self.compiler, 'compiler_so', None),
+            getattr(self.compiler, 'linker_so', None),
+            ext.extra_compile_args,
+            ext.extra_link_args,
+            ext.define_macros,
+            ext.include_dirs,
+            ext.library_dirs,
+            ext.libraries,
+            ext.runtime_library_dirs,
+        )).encode('utf-8'))
+        libarchive_header = find_libarchive_header(list(ext.include_dirs or []) + list(self.compiler.include_dirs or []))
+        # The compiled PCH follows from the options above and embeds build paths, so
+        # hashing it would only defeat the cache.
+        pch_outputs = getattr(self, 'pch_outputs', set())
+        inputs = list(ext.sources) + [path for path in ext.depends or [] if path not in pch_outputs]
+        if libarchive_header:
+            inputs.append(str(libarchive_header))
+        for path in inputs:
+            digest.update(path.encode('utf-8'))
+            digest.update(Path(path).read_bytes())
+        return digest.hexdigest()
+
+    def build_extension(self, ext: Extension) -> None:
+        cache_dir = resolve_extension_cache_dir()
+        if cache_dir is None:
+            super().build_extension(ext)
+            return
+
+        ext_path = Path(self.get_ext_fullpath(ext.name))
+        cached = cache_dir / self.extension_cache_key(ext) / ext_path.name
+        if cached.exists():
+            ext_path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(cached, ext_path)
+            print(f"Reusing cached extension build: {cached}")
+            return
+
+        super().build_extension(ext)
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        partial = cached.with_name(f"{cached.name}.{os.getpid()}.tmp")
+        shutil.copy2(ext_path, partial)
+        os.replace(partial, cached)
+
+    def train_pgo_profile(self, profile_dir: Path) -> bool:
+        archives = [str(path) for path in (archive_r_root / 'test_data' / name for name in PGO_TRAINING_ARCHIVES) if path.exists()]
+        if not archives:
+            print("Warning: no PGO training archives found in test_data, building without PGO", file=sys.stderr)
+            return False
+        module_dir = str(Path(self.get_ext_fullpath('archive_r')).parent)
+        env = dict(os.environ, LLVM_PROFILE_FILE=str(profile_dir / 'archive_r-%p.profraw'))
+        result = subprocess.run([sys.executable, '-c', PGO_TRAINING_SCRIPT, module_dir] + archives, env=env, check=False)
+        if result.returncode != 0:
+            print("Warning: PGO training run failed, building without PGO", file=sys.stderr)
+            return False
+        return True
+
+    def pgo_use_flags(self, profile_dir: Path, compiler_family: str) -> List[str]:
+        if compiler_family != 'clang':
+            # GCC reads the .gcda files matching each object path; the correction
+            # tolerates counters from the threaded traversal.
+            return [f"-fprofile-use={profile_dir}", '-fprofile-correction', '-Wno-missing-profile']
+        merged = profile_dir / 'archive_r.profdata'
+        profdata = shutil.which('llvm-profdata')
+        command = [profdata] if profdata else (['xcrun', 'llvm-profdata'] if IS_DARWIN else [])
+        raw_profiles = sorted(str(path) for path in profile_dir.glob('*.profraw'))
+        if not command or not raw_profiles:
+            print("Warning: llvm-profdata or raw profiles unavailable, building without PGO", file=sys.stderr)
+            return []
+        result = subprocess.run(command + ['merge', f"-output={merged}"] + raw_profiles, check=False)
+        if result.returncode != 0:
+            print("Warning: llvm-profdata merge failed, building without PGO", file=sys.stderr)
+            return []
+        return [f"-fprofile-use={merged}"]
+
+    def build_pgo_extensions(self, opts: List[str], link_opts: List[str], compiler_family: str) -> None:
+        profile_dir = Path(self.build_temp).resolve() / 'pgo'
+        if profile_dir.exists():
+            shutil.rmtree(profile_dir)
+        profile_dir.mkdir(parents=True)
+        base_link_args = {ext.name: list(ext.extra_link_args or []) for ext in self.extensions}
+
+        def build_with(flags: List[str]) -> None:
+            for ext in self.extensions:
+                ext.extra_compile_args = opts + flags
+                ext.extra_link_args = _dedupe(base_link_args[ext.name] + link_opts + flags)
+                # Bypass the extension cache: its key does not cover the profile data.
+                build_ext.build_extension(self, ext)
+
+        # Both passes rewrite the same output, so skip the up-to-date check; the
+        # incremental compile stamp covers the flags and rebuilds every unit.
+        self.force = True
+        print(f"PGO: building instrumented extension (profiles in {profile_dir})")
+        build_with([f"-fprofile-generate={profile_dir}"])
+        use_flags = self.pgo_use_flags(profile_dir, compiler_family) if self.train_pgo_profile(profile_dir) else []
+        print("PGO: rebuilding with the collected profile" if use_flags else "PGO: rebuilding without instrumentation")
+        build_with(use_flags)
+
     def build_extensions(self):
         compiler_type = self.compiler.compiler_type
+        compiler_family = detect_compiler_family(self.compiler)
         opts = []
+        link_opts: List[str] = []
         if compiler_type == 'msvc':
             opts = ['/std:c++17', '/EHsc', '/DNOMINMAX']
         else:
-            opts = ['-std=c++17', '-fvisibility=hidden']
-            if system_name == 'darwin':
+            opts = [
+                '-std=c++17',
+                '-pipe',
+                '-fvisibility=hidden',
+                '-fvisibility-inlines-hidden',
+                '-fno-semantic-interposition',
+                '-ffunction-sections',
+                '-fdata-sections',
+            ]
+            # Drop the sections of core symbols the binding never references.
+            link_opts.append('-Wl,-dead_strip' if IS_DARWIN else '-Wl,--gc-sections')
+            if IS_DARWIN:
                 opts.append('-stdlib=libc++')
             if sysroot_override:
                 opts.append(f"--sysroot={sysroot_override}")
         opts.extend(extra_compile_args)
-        
+
+        if self.lto_enabled():
+            if compiler_family == 'msvc':
+                opts.append('/GL')
+                link_opts.append('/LTCG')
+            elif compiler_family == 'clang':
+                opts.append('-flto=thin')
+                link_opts.append('-flto=thin')
+            else:
+                opts.append('-flto=auto')
+                link_opts.append('-flto=auto')
+            print(f"Link-time optimization enabled ({compiler_family})")
+
+        launcher = resolve_compiler_launcher(compiler_family)
+        if launcher:
+            self.use_compiler_launcher(launcher)
+
+        jobs = resolve_build_jobs()
+        self.use_incremental_compile(jobs)
+
+        if IS_LINUX and compiler_family != 'msvc':
+            linker = resolve_fast_linker()
+            linker_flags = self.fast_linker_flags(linker, jobs, opts, link_opts) if linker else []
+            if linker_flags:
+                link_opts.extend(linker_flags)
+                print(f"Linking with {linker}: {' '.join(linker_flags)}")
+            elif linker:
+                print(f"Warning: {linker} linker is not usable with this compiler, using the default", file=sys.stderr)
+
+        self.unit_overrides = {}
+        self.pch_outputs = set()
+        if compiler_family != 'msvc' and env_flag('ARCHIVE_R_PGO', False):
+            self.build_pgo_extensions(opts, link_opts, compiler_family)
+            return
+
         for ext in self.extensions:
             ext.extra_compile_args = opts
-        
+            ext.extra_link_args = _dedupe(list(ext.extra_link_args or []) + link_opts)
+
+        # Opt-in: the binding TU's cost is dominated by template instantiation rather
+        # than header parsing, so the PCH mostly pays off for repeated edit/rebuild loops.
+        if compiler_family != 'msvc' and env_flag('ARCHIVE_R_ENABLE_PCH', False):
+            for ext in self.extensions:
+                if binding_source not in ext.sources:
+                    continue
+                pch_args, pch_depends = self.prepare_binding_pch(ext, compiler_family)
+                if pch_args:
+                    self.unit_overrides[binding_source] = (pch_args, pch_depends)
+                    # setuptools skips an extension newer than its depends; include the PCH there too.
+                    ext.depends = _dedupe(list(ext.depends or []) + pch_depends)
+                    self.pch_outputs.add(pch_depends[-1])
+
         build_ext.build_extensions(self)
 
 ext_modules = [
     Extension(
         'archive_r',
         sources=sources,
+        depends=header_depends,
         include_dirs=base_include_dirs,
         library_dirs=library_dirs,
         libraries=libraries,
@@ -464,11 +1007,18 @@ data_files = []
 if staged_shared_libs:
     data_files.append(('.libs', [str(p) for p in staged_shared_libs]))
 
-setup(
-    version=package_version,
-    cmdclass={'build_ext': BuildExt},
-    ext_modules=ext_modules,
-    long_description=read_readme(),
-    long_description_content_type='text/markdown',
-    data_files=data_files,
-)
+# Vendored sources only need to outlive the packaging commands. Everything else
+# (build_ext --inplace, develop, egg_info, ...) keeps them as a stamp-validated cache.
+cleanup_after_setup = bool({'sdist', 'bdist_wheel'} & set(sys.argv[1:]))
+try:
+    setup(
+        version=package_version,
+        cmdclass={'build_ext': BuildExt},
+        ext_modules=ext_modules,
+        long_description=read_readme(),
+        long_description_content_type='text/markdown',
+        data_files=data_files,
+    )
+finally:
+    if cleanup_after_setup:
+        cleanup_generated()
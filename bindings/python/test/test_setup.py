@@ -0,0 +1,155 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 archive_r Team
+
+import ctypes
+import importlib.util
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+SETUP_PY = Path(__file__).resolve().parent.parent / "setup.py"
+LTO_FLAGS = {"gcc": "-flto=auto", "clang": "-flto=thin"}
+
+
+def _load_setup_module():
+    # Run setup.py's module body for its helpers without invoking setup() itself.
+    spec = importlib.util.spec_from_file_location("archive_r_setup", SETUP_PY)
+    module = importlib.util.module_from_spec(spec)
+    with mock.patch("setuptools.setup"), mock.patch.object(sys, "argv", [str(SETUP_PY), "egg_info"]):
+        spec.loader.exec_module(module)
+    return module
+
+
+@unittest.skipIf(importlib.util.find_spec("pybind11") is None, "setup.py requires pybind11")
+class TestBuildExt(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.setup_module = _load_setup_module()
+
+    def make_build_ext(self):
+        from setuptools import Distribution
+        from setuptools._distutils.ccompiler import new_compiler
+        from setuptools._distutils.sysconfig import customize_compiler
+
+        command = self.setup_module.BuildExt(Distribution({"name": "archive_r"}))
+        command.ensure_finalized()
+        compiler = new_compiler()
+        customize_compiler(compiler)
+        if compiler.compiler_type == "msvc":
+            self.skipTest("the build helpers are only tested with GCC and clang")
+        command.compiler = compiler
+        return command
+
+    def lto_flag(self, command):
+        return LTO_FLAGS[self.setup_module.detect_compiler_family(command.compiler)]
+
+    def test_linker_probe_uses_build_flags(self):
+        command = self.make_build_ext()
+        lto = self.lto_flag(command)
+        with mock.patch.object(self.setup_module.subprocess, "run", wraps=subprocess.run) as run:
+            command.fast_linker_flags("lld", 2, ["-std=c++17", lto], ["-Wl,--gc-sections", lto])
+        probes = [call.args[0] for call in run.call_args_list]
+        self.assertTrue(probes)
+        for probe in probes:
+            self.assertEqual(probe.count(lto), 2, probe)
+            self.assertIn("-Wl,--gc-sections", probe)
+
+    def assert_lto_library_loads(self, command, linker_flags, lto):
+        # A probe that passes must mean a real LTO shared library links and exports its code.
+        with tempfile.TemporaryDirectory() as work_dir:
+            source = Path(work_dir) / "answer.cc"
+            source.write_text('extern "C" int archive_r_answer() { return 42; }\n', encoding="utf-8")
+            library = Path(work_dir) / "libanswer.so"
+            build = (list(command.compiler.compiler_cxx) + ["-fPIC", "-shared", lto, str(source), "-o", str(library)]
+                     + linker_flags)
+            subprocess.run(build, check=True, capture_output=True)
+            self.assertEqual(ctypes.CDLL(str(library)).archive_r_answer(), 42)
+
+    def test_fast_linkers_with_lto(self):
+        command = self.make_build_ext()
+        family = self.setup_module.detect_compiler_family(command.compiler)
+        lto = self.lto_flag(command)
+        for linker in ("mold", "lld", "gold"):
+            with self.subTest(linker=linker):
+                if shutil.which(f"ld.{linker}") is None and shutil.which(linker) is None:
+                    self.skipTest(f"{linker} is not installed")
+                flags = command.fast_linker_flags(linker, 2, [lto], [lto])
+                if linker == "lld" and family == "gcc":
+                    # lld cannot read GCC's LTO IR, so it must not be chosen.
+                    self.assertEqual(flags, [])
+                elif flags:
+                    self.assert_lto_library_loads(command, flags, lto)
+
+    def test_unusable_linker_is_rejected(self):
+        command = self.make_build_ext()
+        lto = self.lto_flag(command)
+        self.assertEqual(command.fast_linker_flags("archive-r-no-such-linker", 2, [lto], [lto]), [])
+
+    def prepare_pch(self, command, build_temp, extra_compile_args=("-std=c++17",)):
+        from setuptools import Extension
+
+        command.build_temp = str(build_temp)
+        ext = Extension("pch_probe", sources=[], language="c++", extra_compile_args=list(extra_compile_args))
+        family = self.setup_module.detect_compiler_family(command.compiler)
+        with mock.patch.object(self.setup_module, "BINDING_PCH_HEADER", "#include <vector>\n"):
+            pch_args, pch_depends = command.prepare_binding_pch(ext, family)
+        self.assertTrue(pch_args, "precompiled header build failed")
+        return pch_args, pch_depends, Path(pch_depends[-1])
+
+    def test_pch_rebuild_recompiles_consuming_unit(self):
+        command = self.make_build_ext()
+        with tempfile.TemporaryDirectory() as work_dir:
+            work = Path(work_dir)
+            pch_args, pch_depends, compiled = self.prepare_pch(command, work / "build")
+            self.assertIn(str(compiled), pch_depends)
+            self.assertTrue(compiled.exists())
+
+            source = work / "unit.cc"
+            source.write_text("#include <vector>\nint unit() { return std::vector<int>(2).size(); }\n", encoding="utf-8")
+            command.unit_overrides = {str(source): (pch_args, pch_depends)}
+            command.use_incremental_compile(1)
+
+            def compile_unit():
+                [obj] = command.compiler.compile([str(source)], output_dir=str(work / "objects"),
+                                                 extra_postargs=["-std=c++17"])
+                return os.stat(obj).st_mtime_ns
+
+            first = compile_unit()
+            self.assertEqual(compile_unit(), first, "up-to-date unit was recompiled")
+
+            compiled.unlink()
+            self.prepare_pch(command, work / "build")
+            self.assertTrue(compiled.exists())
+            self.assertGreater(compile_unit(), first, "unit was not rebuilt after its PCH was")
+
+    def test_pch_rebuilt_when_flags_change(self):
+        command = self.make_build_ext()
+        with tempfile.TemporaryDirectory() as work_dir:
+            build_temp = Path(work_dir) / "build"
+            compiled = self.prepare_pch(command, build_temp)[2]
+            built = compiled.stat().st_mtime_ns
+            self.prepare_pch(command, build_temp)
+            self.assertEqual(compiled.stat().st_mtime_ns, built, "unchanged PCH was rebuilt")
+            self.prepare_pch(command, build_temp, ("-std=c++17", "-DARCHIVE_R_PCH_TEST"))
+            self.assertGreater(compiled.stat().st_mtime_ns, built)
+
+    def test_pch_rebuilt_when_compiler_changes(self):
+        command = self.make_build_ext()
+        with tempfile.TemporaryDirectory() as work_dir:
+            build_temp = Path(work_dir) / "build"
+            compiled = self.prepare_pch(command, build_temp)[2]
+            built = compiled.stat().st_mtime_ns
+            # Same command line, but the compiler binary behind it was replaced.
+            upgraded = [("/usr/bin/c++", 1, 1)]
+            with mock.patch.object(self.setup_module, "program_fingerprint", return_value=upgraded):
+                self.prepare_pch(command, build_temp)
+            self.assertGreater(compiled.stat().st_mtime_ns, built)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,14 +3,55 @@
 
 from __future__ import annotations
 
+import math
 import os
+import select
 import signal
 import subprocess
 import sys
+import time
 from typing import List
 
 
-def _terminate_process(proc: subprocess.Popen[bytes], grace: float = 5.0) -> None:
+# poll() takes milliseconds as a C int; longer waits are split into several polls.
+_MAX_POLL_MS = 2**31 - 1
+
+
+def _wait_process(proc: subprocess.Popen[bytes], timeout: float) -> int:
+    """Wait for proc to exit, raising subprocess.TimeoutExpired after timeout seconds.
+
+    A timeout of inf (or nan) waits without limit. On Linux the wait blocks on a
+    pidfd, which becomes readable exactly when the child exits; Popen.wait(timeout=...)
+    instead wakes up periodically to poll.
+    """
+    deadline = time.monotonic() + timeout if math.isfinite(timeout) else None
+    pidfd_open = getattr(os, "pidfd_open", None)
+    if pidfd_open is None or not hasattr(select, "poll"):
+        return proc.wait(timeout=None if deadline is None else timeout)
+    try:
+        pidfd = pidfd_open(proc.pid)
+    except OSError:
+        # Already reaped, or pidfd unsupported by the running kernel.
+        return proc.wait(timeout=None if deadline is None else timeout)
+    try:
+        poller = select.poll()
+        poller.register(pidfd, select.POLLIN)
+        while True:
+            if deadline is None:
+                wait_ms = None
+            else:
+                remaining = deadline - time.monotonic()
+                wait_ms = min(max(0, math.ceil(remaining * 1000)), _MAX_POLL_MS)
+            if poller.poll(wait_ms):
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                raise subprocess.TimeoutExpired(proc.args, timeout)
+    finally:
+        os.close(pidfd)
+    return proc.wait()
+
+
+def _terminate_process(proc: subprocess.Popen[bytes], grace: float = 2.0) -> None:
     """Attempt graceful termination, fall back to kill if needed."""
     try:
         if os.name == "nt":
@@ -21,12 +62,14 @@ def _terminate_process(proc: subprocess.Popen[bytes], grace: float = 5.0) -> Non
         print(f"[run_with_timeout] Failed to send terminate signal: {exc}", file=sys.stderr, flush=True)
 
     try:
-        proc.wait(timeout=grace)
+        _wait_process(proc, grace)
     except subprocess.TimeoutExpired:
         try:
             proc.kill()
         except Exception as exc:
             print(f"[run_with_timeout] Failed to kill process: {exc}", file=sys.stderr, flush=True)
+            return
+        proc.wait()
 
 
 def run_with_timeout(timeout_seconds: float, command: List[str]) -> int:
@@ -40,7 +83,7 @@ def run_with_timeout(timeout_seconds: float, command: List[str]) -> int:
         return 127
 
     try:
-        ret = proc.wait(timeout=timeout_seconds)
+        ret = _wait_process(proc, timeout_seconds)
         print(f"[run_with_timeout] Finished with exit code {ret}", flush=True)
         return ret
     except subprocess.TimeoutExpired:
@@ -8,4 +8,5 @@ TEST_TIMEOUT="${RUN_TESTS_TIMEOUT:-120}"
 BINDINGS_TIMEOUT="${RUN_BINDINGS_TIMEOUT:-120}"
 
 RUN_TESTS_WRAPPER_TIMEOUT=0 python3 ./run_with_timeout.py "$TEST_TIMEOUT" ./run_tests.sh
+python3 ./run_with_timeout.py "$TEST_TIMEOUT" python3 -m unittest discover -s test -p 'test_*.py'
 python3 ./run_with_timeout.py "$BINDINGS_TIMEOUT" ./bindings/ruby/run_binding_tests.sh
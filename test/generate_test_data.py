@@ -1,10 +1,144 @@
-import zipfile
+import multiprocessing
+import os
+import struct
+import time
+import zlib
+from array import array
 
-def create_test_archive(filename, num_files):
+# ZIP_STORED records are written directly instead of going through
+# ZipFile.writestr(), which costs a ZipInfo plus several writes per file.
+_LOCAL_HEADER = struct.Struct('<IHHHHHIIIHH')
+_CENTRAL_HEADER = struct.Struct('<IHHHHHHIIIHHHHHII')
+_END_RECORD = struct.Struct('<IHHHHIIH')
+_ZIP64_END_RECORD = struct.Struct('<IQHHIIQQQQ')
+_ZIP64_END_LOCATOR = struct.Struct('<IIQI')
+
+_VERSION = 20
+_VERSION_ZIP64 = 45
+_MADE_BY_UNIX = 3 << 8
+_FILE_ATTRIBUTES = 0o600 << 16
+_MAX_COUNT = 0xFFFF
+_MAX_OFFSET = 0xFFFFFFFF
+
+_NAME_FORMAT = b"file_%05d.txt"
+_PAYLOAD_FORMAT = b"This is content of file %d"
+_NAME_FIXED = len(_NAME_FORMAT % 0) - 5
+_PAYLOAD_FIXED = len(_PAYLOAD_FORMAT % 0) - 1
+# Each worker task covers roughly this many bytes of local records.
+_SHARD_BYTES = 16 << 20
+
+
+def _dos_timestamp(when):
+    t = time.localtime(when)
+    dos_time = (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+    dos_date = ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+    return dos_time, dos_date
+
+
+def _record_sizes(start, stop):
+    """Return (local, central) byte sizes of entries start..stop-1 without building them."""
+    local = central = 0
+    digits, low = 1, 0
+    while low < stop:
+        high = 10 ** digits
+        count = max(0, min(stop, high) - max(start, low))
+        name_len = _NAME_FIXED + max(5, digits)
+        local += count * (_LOCAL_HEADER.size + name_len + _PAYLOAD_FIXED + digits)
+        central += count * (_CENTRAL_HEADER.size + name_len)
+        digits, low = digits + 1, high
+    return local, central
+
+
+def _build_shard(task):
+    shard, start, stop, local_base, dos_time, dos_date = task
+    # Names, payloads, checksums and offsets are kept as parallel arrays so the
+    # headers can be packed into preallocated buffers in one pass.
+    names = [_NAME_FORMAT % i for i in range(start, stop)]
+    payloads = [_PAYLOAD_FORMAT % i for i in range(start, stop)]
+    crcs = array('L', map(zlib.crc32, payloads))
+    offsets = array('Q', bytes(8 * len(names)))
+    local_size, central_size = _record_sizes(start, stop)
+    local = bytearray(local_size)
+    central = bytearray(central_size)
+
+    pos = 0
+    for i, (name, payload) in enumerate(zip(names, payloads)):
+        offsets[i] = local_base + pos
+        _LOCAL_HEADER.pack_into(
+            local, pos, 0x04034B50, _VERSION, 0, 0, dos_time, dos_date,
+            crcs[i], len(payload), len(payload), len(name), 0)
+        pos += _LOCAL_HEADER.size
+        local[pos:pos + len(name)] = name
+        pos += len(name)
+        local[pos:pos + len(payload)] = payload
+        pos += len(payload)
+
+    pos = 0
+    for i, name in enumerate(names):
+        size = len(payloads[i])
+        _CENTRAL_HEADER.pack_into(
+            central, pos, 0x02014B50, _MADE_BY_UNIX | _VERSION, _VERSION, 0, 0, dos_time, dos_date,
+            crcs[i], size, size, len(name), 0, 0, 0, 0, _FILE_ATTRIBUTES, offsets[i])
+        pos += _CENTRAL_HEADER.size
+        central[pos:pos + len(name)] = name
+        pos += len(name)
+    return shard, local, central
+
+
+def create_test_archive(filename, num_files, workers=None):
     print(f"Creating {filename} with {num_files} files...")
-    with zipfile.ZipFile(filename, 'w', zipfile.ZIP_STORED) as zf:
-        for i in range(num_files):
-            zf.writestr(f"file_{i:05d}.txt", f"This is content of file {i}")
+    dos_time, dos_date = _dos_timestamp(time.time())
+    local_size, central_size = _record_sizes(0, num_files)
+    if local_size > _MAX_OFFSET:
+        raise ValueError("archive too large for 32-bit ZIP offsets")
+
+    # Shard boundaries and offsets are known up front, so shards can be built in
+    # any order and written straight to their final position. Shards stay near
+    # _SHARD_BYTES however many workers there are, which bounds the memory each
+    # one holds at a time.
+    num_shards = max(1, -(-local_size // _SHARD_BYTES))
+    workers = min(workers or os.cpu_count() or 1, num_shards)
+    bounds = [num_files * k // num_shards for k in range(num_shards + 1)]
+    tasks = []
+    local_bases, central_bases = [], []
+    local_base = central_base = 0
+    for shard in range(num_shards):
+        start, stop = bounds[shard], bounds[shard + 1]
+        tasks.append((shard, start, stop, local_base, dos_time, dos_date))
+        local_bases.append(local_base)
+        central_bases.append(local_size + central_base)
+        shard_local, shard_central = _record_sizes(start, stop)
+        local_base += shard_local
+        central_base += shard_central
+
+    with open(filename, 'wb') as fp:
+        if workers == 1:
+            results = map(_build_shard, tasks)
+            pool = None
+        else:
+            pool = multiprocessing.Pool(workers)
+            results = pool.imap_unordered(_build_shard, tasks)
+        try:
+            for shard, local, central in results:
+                fp.seek(local_bases[shard])
+                fp.write(local)
+                fp.seek(central_bases[shard])
+                fp.write(central)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+        fp.seek(local_size + central_size)
+        count = num_files
+        if num_files > _MAX_COUNT:
+            zip64_offset = local_size + central_size
+            fp.write(_ZIP64_END_RECORD.pack(
+                0x06064B50, _ZIP64_END_RECORD.size - 12, _MADE_BY_UNIX | _VERSION_ZIP64,
+                _VERSION_ZIP64, 0, 0, num_files, num_files, central_size, local_size))
+            fp.write(_ZIP64_END_LOCATOR.pack(0x07064B50, 0, zip64_offset, 1))
+            count = _MAX_COUNT
+        fp.write(_END_RECORD.pack(0x06054B50, 0, 0, count, count, central_size, local_size, 0))
     print("Done.")
 
 if __name__ == "__main__":
@@ -0,0 +1,87 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 archive_r Team
+
+import contextlib
+import os
+import sys
+import tarfile
+import tempfile
+import types
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "test_data"))
+
+import create_test_data  # noqa: E402
+
+
+def _members(archive: Path):
+    with tarfile.open(archive) as tar:
+        return [
+            (member.name, member.type, member.mode, member.uid, member.gid, member.uname, member.gname,
+             member.size, member.mtime, tar.extractfile(member).read())
+            for member in tar.getmembers()
+        ]
+
+
+class TestLibarchiveWriter(unittest.TestCase):
+    def setUp(self):
+        work = tempfile.TemporaryDirectory()
+        self.addCleanup(work.cleanup)
+        self.work = Path(work.name)
+        self.source = self.work / "source"
+        long_dir = self.source.joinpath(*(f"directory_{i:02d}" for i in range(12)))
+        long_dir.mkdir(parents=True)
+        (self.source / "root.txt").write_bytes(b"root\n" * 100)
+        (self.source / "empty.txt").write_bytes(b"")
+        script = self.source / "nested" / "run.sh"
+        script.parent.mkdir()
+        script.write_bytes(b"#!/bin/sh\n")
+        script.chmod(0o755)
+        # Longer than the 100-byte ustar name field, so it needs the prefix field
+        (long_dir / "deep_file.bin").write_bytes(create_test_data.BINARY_PATTERN * 40)
+        os.link(self.source / "root.txt", self.source / "nested" / "root_link.txt")
+
+    def write_archive(self, name: str, use_libarchive: bool, arcname_root=None, compress=True) -> Path:
+        archive = self.work / name
+        backend = create_test_data.libarchive if use_libarchive else None
+        with mock.patch.object(create_test_data, "libarchive", backend):
+            create_test_data.TestDataGenerator(self.work).create_tar_gz_from_path(
+                archive, self.source, arcname_root, compress=compress)
+        return archive
+
+    @unittest.skipIf(create_test_data.libarchive is None, "usable libarchive-c is not installed")
+    def test_members_match_tarfile_writer(self):
+        for arcname_root in (None, "prefix"):
+            for compress in (True, False):
+                with self.subTest(arcname_root=arcname_root, compress=compress):
+                    suffix = ".tar.gz" if compress else ".tar"
+                    expected = _members(self.write_archive(f"tarfile{suffix}", False, arcname_root, compress))
+                    actual = _members(self.write_archive(f"libarchive{suffix}", True, arcname_root, compress))
+                    self.assertEqual(len(expected), 5)
+                    self.assertEqual(actual, expected)
+
+    def test_incompatible_libarchive_is_not_used(self):
+        # Older libarchive-c releases reject ownership (or integer mtime) keywords.
+        class OldArchiveWrite:
+            def add_file_from_memory(self, entry_path, entry_size, entry_data, filetype=None,
+                                     permission=0o664, atime=None, mtime=None, ctime=None, birthtime=None):
+                raise AssertionError("not reached")
+
+        @contextlib.contextmanager
+        def custom_writer(write_func, format_name, filter_name=None):
+            yield OldArchiveWrite()
+
+        old_module = types.ModuleType("libarchive")
+        old_module.custom_writer = custom_writer
+        with mock.patch.dict(sys.modules, {"libarchive": old_module}):
+            self.assertIsNone(create_test_data._load_libarchive())
+
+    def test_missing_libarchive_is_not_used(self):
+        with mock.patch.dict(sys.modules, {"libarchive": None}):
+            self.assertIsNone(create_test_data._load_libarchive())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 archive_r Team
+
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import run_with_timeout  # noqa: E402
+
+
+def _python(code: str) -> list:
+    return [sys.executable, "-c", code]
+
+
+class TestRunWithTimeout(unittest.TestCase):
+    def test_exit_code_is_returned(self):
+        self.assertEqual(run_with_timeout.run_with_timeout(30, _python("raise SystemExit(3)")), 3)
+
+    def test_timeout_expires(self):
+        self.assertEqual(run_with_timeout.run_with_timeout(0.2, _python("import time; time.sleep(30)")), 124)
+
+    def test_zero_timeout(self):
+        self.assertEqual(run_with_timeout.run_with_timeout(0, _python("import time; time.sleep(30)")), 124)
+
+    def test_infinite_timeout(self):
+        self.assertEqual(run_with_timeout.run_with_timeout(float("inf"), _python("raise SystemExit(3)")), 3)
+
+    def test_nan_timeout_waits_without_limit(self):
+        self.assertEqual(run_with_timeout.run_with_timeout(float("nan"), _python("raise SystemExit(3)")), 3)
+
+    def test_main_accepts_inf(self):
+        argv = ["run_with_timeout.py", "inf"] + _python("raise SystemExit(5)")
+        with mock.patch.object(sys, "argv", argv):
+            self.assertEqual(run_with_timeout.main(), 5)
+
+    def test_very_large_timeout(self):
+        # Far beyond the 2**31-1 ms a single poll() can wait.
+        self.assertEqual(run_with_timeout.run_with_timeout(1e12, _python("raise SystemExit(3)")), 3)
+
+    @unittest.skipUnless(hasattr(os, "pidfd_open"), "pidfd wait path is Linux-only")
+    def test_timeout_longer_than_one_poll(self):
+        # A child outliving one poll() interval must not be reported as timed out.
+        proc = subprocess.Popen(_python("import time; time.sleep(0.5)"))
+        try:
+            with mock.patch.object(run_with_timeout, "_MAX_POLL_MS", 50):
+                self.assertEqual(run_with_timeout._wait_process(proc, 30), 0)
+        finally:
+            proc.kill()
+            proc.wait()
+
+    @unittest.skipUnless(hasattr(os, "pidfd_open"), "pidfd wait path is Linux-only")
+    def test_deadline_spanning_several_polls_expires(self):
+        proc = subprocess.Popen(_python("import time; time.sleep(30)"))
+        try:
+            with mock.patch.object(run_with_timeout, "_MAX_POLL_MS", 50):
+                with self.assertRaises(subprocess.TimeoutExpired):
+                    run_with_timeout._wait_process(proc, 0.3)
+        finally:
+            proc.kill()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,17 +4,234 @@ Archive test data generator
 Creates comprehensive test archives with proper multipart files
 """
 
+import contextlib
+import functools
+import gzip
+import io
+import logging
+import os
 import sys
 import shutil
+import stat
+import subprocess
 import tarfile
 import tempfile
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Iterator, List, Optional, Tuple, Union
+
+try:
+    import grp
+    import pwd
+except ImportError:  # Windows
+    grp = pwd = None
+
+
+def _load_libarchive():
+    """
+    Optional libarchive-c, which writes tar headers and gzip in C, much faster than tarfile.
+    Releases differ in which member attributes add_file_from_memory() accepts, so a probe
+    member is written first; if that fails or reads back differently, tarfile is used.
+    """
+    try:
+        import libarchive
+    except ImportError:
+        return None
+    probe = dict(uid=1234, gid=5678, uname='archive_r', gname='testdata', mtime=1234567890)
+    output = io.BytesIO()
+    try:
+        with libarchive.custom_writer(output.write, 'ustar') as archive:
+            archive.add_file_from_memory('probe.txt', 5, b'probe', permission=0o640, **probe)
+        output.seek(0)
+        with tarfile.open(fileobj=output) as tar:
+            member = tar.getmember('probe.txt')
+            written = dict(uid=member.uid, gid=member.gid, uname=member.uname, gname=member.gname,
+                           mtime=member.mtime)
+            if written != probe or member.mode != 0o640 or tar.extractfile(member).read() != b'probe':
+                return None
+    except Exception:
+        return None
+    return libarchive
+
+
+libarchive = _load_libarchive()
+
+logger = logging.getLogger('testdata')
+
+# One period of the deterministic binary file content.
+BINARY_PATTERN = bytes((i * 7 + 13) % 256 for i in range(256))
+
+# Test data is regenerated on demand, so favor deflate speed over ratio.
+COMPRESS_LEVEL = 1
+
+# Buffer size for archive and part file output; tar writes in 512-byte blocks.
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+@functools.lru_cache(maxsize=None)
+def _owner_names(uid: int, gid: int) -> Tuple[str, str]:
+    """User and group names recorded in tar headers, as tarfile.gettarinfo() looks them up"""
+    uname = gname = ''
+    if pwd:
+        try:
+            uname = pwd.getpwuid(uid)[0]
+        except KeyError:
+            pass
+    if grp:
+        try:
+            gname = grp.getgrgid(gid)[0]
+        except KeyError:
+            pass
+    return uname, gname
+
+
+@functools.lru_cache(maxsize=None)
+def _pattern_bytes(unit: bytes, count: int) -> bytes:
+    """unit repeated count times, built once per distinct pattern"""
+    return unit * count
+
+
+def _iter_files(root: Path) -> List[Tuple[str, str]]:
+    """
+    Return (path, relative posix path) for every file below root, in the order
+    sorted(root.rglob('*')) would give. os.scandir entries carry their file type,
+    so the walk does not stat each entry again.
+    """
+    files = []
+    pending = [(str(root), '')]
+    while pending:
+        directory, prefix = pending.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                rel_path = prefix + entry.name
+                if entry.is_dir():
+                    pending.append((entry.path, rel_path + '/'))
+                elif entry.is_file():
+                    files.append((entry.path, rel_path))
+    # sorted(rglob()) compares Paths component by component, so 'a/b' sorts before
+    # 'a.txt', where a plain string sort would put 'a.txt' first ('.' < '/').
+    # Mapping '/' to NUL, which sorts below every name character, reproduces the
+    # Path order exactly. The key is case-sensitive, like POSIX Paths; Windows
+    # Paths compare case-insensitively, so mixed-case names may order differently there.
+    files.sort(key=lambda item: item[1].replace('/', '\0'))
+    return files
+
+
+def _link_or_copy(src: Path, dst: Path):
+    """
+    Hard-link dst to src, copying instead when linking fails (e.g. across devices).
+    Archives are opened with dereference=True so links are stored as regular files.
+    """
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy(src, dst)
+
+
+def _remove_tree(path: Path):
+    """Delete a directory tree, with rm -rf where it exists; it needs no Python call per file"""
+    rm = shutil.which('rm') if os.name == 'posix' else None
+    if rm and subprocess.run([rm, '-rf', '--', str(path)]).returncode == 0:
+        return
+    shutil.rmtree(path, ignore_errors=True)
+
+
+@contextlib.contextmanager
+def _open_tar_writer(path: Path, compress: bool = True) -> Iterator[tarfile.TarFile]:
+    """
+    Open a tar.gz (or a plain tar if compress is False) for writing,
+    compressing through pigz when it is installed
+    """
+    pigz = shutil.which('pigz') if compress else None
+    with open(path, 'wb', buffering=WRITE_BUFFER_SIZE) as out:
+        if not pigz:
+            options = {'compresslevel': COMPRESS_LEVEL} if compress else {}
+            with tarfile.open(fileobj=out, mode='w:gz' if compress else 'w', format=tarfile.USTAR_FORMAT,
+                              dereference=True, **options) as tar:
+                yield tar
+            return
+        
+        # pigz compresses on all cores; tarfile only has to stream the uncompressed tar to it
+        command = [pigz, '-c', f'-{COMPRESS_LEVEL}']
+        proc = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=out, bufsize=WRITE_BUFFER_SIZE)
+        try:
+            with tarfile.open(fileobj=proc.stdin, mode='w|', bufsize=WRITE_BUFFER_SIZE, format=tarfile.USTAR_FORMAT,
+                              dereference=True) as tar:
+                yield tar
+        finally:
+            proc.stdin.close()
+            returncode = proc.wait()
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, command)
+
+
+class SplitWriter:
+    """Write-only file object that spreads its output over numbered part files"""
+    
+    def __init__(self, base_path: Path, part_size: int):
+        self.base_path = base_path
+        self.part_size = part_size
+        self.parts: List[Path] = []
+        self.size = 0
+        self._current = None
+        self._remaining = 0
+    
+    def part_path(self, part_num: int) -> Path:
+        # Parts are 1-indexed: .part001, .part002, etc.
+        return self.base_path.parent / f"{self.base_path.name}.part{part_num:03d}"
+    
+    def write(self, data) -> int:
+        view = memoryview(data)
+        written = len(view)
+        while view:
+            if self._remaining == 0:
+                self._next_part()
+            chunk = view[:self._remaining]
+            self._current.write(chunk)
+            self._remaining -= len(chunk)
+            view = view[len(chunk):]
+        self.size += written
+        return written
+    
+    def pad_to(self, num_parts: int):
+        """Zero-fill the last part and add empty ones until num_parts full parts exist"""
+        self.close()
+        for part_num in range(max(len(self.parts), 1), num_parts + 1):
+            path = self.part_path(part_num)
+            with open(path, 'ab') as f:
+                f.truncate(self.part_size)
+            if part_num > len(self.parts):
+                self.parts.append(path)
+    
+    def close(self):
+        if self._current is not None:
+            if self._remaining:
+                # Drop the preallocated space the last part did not use
+                self._current.truncate()
+            self._current.close()
+            self._current = None
+    
+    def _next_part(self):
+        self.close()
+        path = self.part_path(len(self.parts) + 1)
+        self._current = open(path, 'wb', buffering=WRITE_BUFFER_SIZE)
+        self.parts.append(path)
+        self._remaining = self.part_size
+        if hasattr(os, 'posix_fallocate'):
+            # Reserve the whole part up front instead of growing it write by write
+            try:
+                os.posix_fallocate(self._current.fileno(), 0, self.part_size)
+            except OSError:
+                pass
+
 
 class TestDataGenerator:
     def __init__(self, output_dir: Path):
         self.output_dir = Path(output_dir)
         self.work_dir = None
+        # Content key -> first file written with it; later files hard-link to it
+        self._content_cache = {}
+        # Directories known to exist, so file helpers can skip mkdir
+        self._known_dirs = set()
         
     def __enter__(self):
         self.work_dir = Path(tempfile.mkdtemp(prefix="test_data_"))
@@ -22,121 +239,192 @@ class TestDataGenerator:
         
     def __exit__(self, exc_type, exc_val, exc_tb):
         if self.work_dir and self.work_dir.exists():
-            shutil.rmtree(self.work_dir)
+            _remove_tree(self.work_dir)
     
-    def create_text_file(self, path: Path, content: str):
+    def create_text_file(self, path: Path, content: Union[str, bytes]):
         """Create a text file with specified content"""
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(content)
-        print(f"  Created: {path.name} ({len(content)} bytes)")
+        self._ensure_dir(path.parent)
+        if isinstance(content, str):
+            content = content.encode()
+        self._write_cached(path, ('text', content), lambda target: target.write_bytes(content))
+        logger.debug("  Created: %s (%d bytes)", path.name, len(content))
     
     def create_binary_file(self, path: Path, size: int):
         """Create a binary file with random data"""
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, 'wb') as f:
-            # Use predictable data for reproducibility
-            data = bytes([(i * 7 + 13) % 256 for i in range(size)])
-            f.write(data)
-        print(f"  Created: {path.name} ({size} bytes)")
+        self._ensure_dir(path.parent)
+        
+        def write(target: Path):
+            with open(target, 'wb') as f:
+                # Use predictable data for reproducibility; (i * 7 + 13) % 256 repeats
+                # every 256 bytes, so one period is tiled instead of computed per byte.
+                repeats = size // len(BINARY_PATTERN) + 1
+                data = (BINARY_PATTERN * repeats)[:size]
+                f.write(data)
+        
+        self._write_cached(path, ('binary', size), write)
+        logger.debug("  Created: %s (%d bytes)", path.name, size)
+    
+    def _ensure_dir(self, directory: Path):
+        """Create a directory (and its parents) once per generator"""
+        if directory not in self._known_dirs:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._known_dirs.add(directory)
+    
+    def _write_cached(self, path: Path, cache_key, write: Callable[[Path], None]):
+        """
+        Hard-link path to an earlier file with the same content, or write it.
+        Archives are opened with dereference=True so links are stored as regular files.
+        """
+        original = self._content_cache.get(cache_key)
+        if original is not None:
+            try:
+                os.link(original, path)
+                return
+            except OSError:
+                # The original was removed, or links are unsupported here
+                pass
+        write(path)
+        self._content_cache[cache_key] = path
+    
+    def create_tar_gz(self, archive_path: Path, source_dir: Path, compress: bool = True):
+        """Create a tar.gz archive from a directory (a plain tar if compress is False)"""
+        self.create_tar_gz_from_path(archive_path, source_dir, None, compress=compress)
+    
+    def create_tar_gz_from_path(self, archive_path: Path, root: Path, arcname_root: Optional[str],
+                                compress: bool = True):
+        """
+        Create a tar.gz archive of the files below root, stored under arcname_root
+        (or at the top level when it is None), without copying them elsewhere first
+        """
+        if libarchive is not None:
+            self._write_libarchive(archive_path, root, arcname_root, compress)
+        else:
+            with _open_tar_writer(archive_path, compress=compress) as tar:
+                self.add_directory(tar, root, arcname_root)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("  Created archive: %s (%d bytes)", archive_path.name, archive_path.stat().st_size)
+    
+    def add_directory(self, tar: tarfile.TarFile, source_dir: Path, arcname_root: Optional[str] = None):
+        """Add every file below source_dir, with paths relative to it (under arcname_root if given)"""
+        # Headers are built from one stat() per file with cached owner names;
+        # tar.add() would repeat the passwd/group lookups for every member
+        for path, rel_path in _iter_files(source_dir):
+            st = os.stat(path)
+            tarinfo = tarfile.TarInfo(f"{arcname_root}/{rel_path}" if arcname_root else rel_path)
+            tarinfo.mode = st.st_mode
+            tarinfo.uid = st.st_uid
+            tarinfo.gid = st.st_gid
+            tarinfo.size = st.st_size
+            tarinfo.mtime = st.st_mtime
+            tarinfo.uname, tarinfo.gname = _owner_names(st.st_uid, st.st_gid)
+            with open(path, 'rb') as f:
+                tar.addfile(tarinfo, f)
     
-    def create_tar_gz(self, archive_path: Path, source_dir: Path):
-        """Create a tar.gz archive from a directory"""
-        with tarfile.open(archive_path, 'w:gz') as tar:
-            for item in sorted(source_dir.rglob('*')):
-                if item.is_file():
-                    arcname = item.relative_to(source_dir)
-                    tar.add(item, arcname=str(arcname))
-        print(f"  Created archive: {archive_path.name} ({archive_path.stat().st_size} bytes)")
+    def _write_libarchive(self, archive_path: Path, root: Path, arcname_root: Optional[str], compress: bool):
+        """Same members as add_directory(), with headers and gzip done by libarchive instead of tarfile"""
+        filter_name = 'gzip' if compress else None
+        options = f'gzip:compression-level={COMPRESS_LEVEL}' if compress else ''
+        with libarchive.file_writer(str(archive_path), 'ustar', filter_name, options=options) as archive:
+            for path, rel_path in _iter_files(root):
+                st = os.stat(path)
+                uname, gname = _owner_names(st.st_uid, st.st_gid)
+                with open(path, 'rb') as f:
+                    archive.add_file_from_memory(
+                        f"{arcname_root}/{rel_path}" if arcname_root else rel_path,
+                        st.st_size,
+                        iter(functools.partial(f.read, WRITE_BUFFER_SIZE), b''),
+                        permission=stat.S_IMODE(st.st_mode),
+                        uid=st.st_uid,
+                        gid=st.st_gid,
+                        uname=uname,
+                        gname=gname,
+                        mtime=int(st.st_mtime),
+                    )
     
     def create_multipart(self, base_path: Path, source_dir: Path, 
                         part_size: int, num_parts: int, 
-                        min_parts: Optional[int] = None) -> List[Path]:
+                        min_parts: Optional[int] = None,
+                        compress: bool = True) -> List[Path]:
         """
         Create multipart archive files
         Returns list of part file paths
         
         If min_parts is specified, will ensure at least that many parts are created
-        by padding the data if necessary.
+        by padding the data if necessary. With compress=False the split archive
+        is a plain tar.
         """
-        # First create the tar.gz archive
-        temp_tar = base_path.parent / f"{base_path.name}.temp.tar.gz"
-        self.create_tar_gz(temp_tar, source_dir)
-        
-        # Read the archive
-        with open(temp_tar, 'rb') as f:
-            data = f.read()
-        
-        archive_size = len(data)
-        print(f"  Archive size: {archive_size} bytes")
+        # Stream the archive straight into the part files; no temporary archive
+        # is written and read back
+        writer = SplitWriter(base_path, part_size)
+        try:
+            with contextlib.ExitStack() as stack:
+                sink = writer
+                if compress:
+                    sink = stack.enter_context(
+                        gzip.GzipFile(fileobj=writer, mode='wb', compresslevel=COMPRESS_LEVEL, mtime=0))
+                tar = stack.enter_context(tarfile.open(fileobj=sink, mode='w|', bufsize=WRITE_BUFFER_SIZE, format=tarfile.USTAR_FORMAT, dereference=True))
+                self.add_directory(tar, source_dir)
+        finally:
+            writer.close()
+        
+        archive_size = writer.size
+        logger.debug("  Archive size: %d bytes", archive_size)
         
         # Calculate actual number of parts needed
-        actual_parts = (archive_size + part_size - 1) // part_size
+        actual_parts = len(writer.parts)
         
         # If min_parts is specified and we have fewer parts, pad the data
+        total_size = archive_size
         if min_parts and actual_parts < min_parts:
             required_size = min_parts * part_size
             padding_needed = required_size - archive_size
             # Add padding at the end (will be ignored by tar)
-            data = data + b'\x00' * padding_needed
-            print(f"  Padded with {padding_needed} bytes to create {min_parts} parts")
-            num_parts = min_parts
+            writer.pad_to(min_parts)
+            total_size = required_size
+            logger.debug("  Padded with %d bytes to create %d parts", padding_needed, min_parts)
         elif actual_parts != num_parts:
-            print(f"  Note: Archive needs {actual_parts} parts (requested {num_parts}), using {actual_parts}")
-            num_parts = actual_parts
-        
-        # Split into parts (all parts same size except possibly the last one)
-        part_files = []
-        for i in range(num_parts):
-            part_num = i + 1  # Parts are 1-indexed: .part001, .part002, etc.
-            part_path = base_path.parent / f"{base_path.name}.part{part_num:03d}"
-            
-            start = i * part_size
-            end = min(start + part_size, len(data))
-            
-            with open(part_path, 'wb') as f:
-                f.write(data[start:end])
-            
-            part_files.append(part_path)
-            print(f"  Created part: {part_path.name} ({end - start} bytes)")
+            logger.debug("  Note: Archive needs %d parts (requested %d), using %d", actual_parts, num_parts, actual_parts)
         
-        # Clean up temp file
-        temp_tar.unlink()
+        # All parts are the same size except possibly the last one
+        for index, part_path in enumerate(writer.parts):
+            part_bytes = min(part_size, total_size - index * part_size)
+            logger.debug("  Created part: %s (%d bytes)", part_path.name, part_bytes)
         
-        return part_files
+        return writer.parts
     
     def generate_simple_multipart_test(self):
         """
         Generate: multipart_test.tar.gz
-        Contains: archive.tar.gz split into 2 parts
+        Contains: archive.tar.gz split into 3 parts
         Inside: file1.txt, file2.txt
         """
-        print("\n=== Creating multipart_test.tar.gz ===")
+        logger.info("\n=== Creating multipart_test.tar.gz ===")
         
         work = self.work_dir / "multipart_test"
-        work.mkdir()
+        self._ensure_dir(work)
         
         # Create content for the multipart archive
         content_dir = work / "content"
-        content_dir.mkdir()
-        self.create_text_file(content_dir / "file1.txt", "content1\n" * 10)
-        self.create_text_file(content_dir / "file2.txt", "content2\n" * 10)
+        self._ensure_dir(content_dir)
+        self.create_text_file(content_dir / "file1.txt", _pattern_bytes(b"content1\n", 10))
+        self.create_text_file(content_dir / "file2.txt", _pattern_bytes(b"content2\n", 10))
         
-        # Create multipart archive (2 parts of 100 bytes each)
+        # Create multipart archive (3 parts of 100 bytes each)
         parts = self.create_multipart(
             work / "archive.tar.gz",
             content_dir,
             part_size=100,
-            num_parts=2,
-            min_parts=2  # Ensure at least 2 parts
+            num_parts=3,
+            min_parts=3  # Ensure at least 3 parts
         )
         
         # Package everything into the final archive
         final = self.output_dir / "multipart_test.tar.gz"
-        with tarfile.open(final, 'w:gz') as tar:
+        with _open_tar_writer(final) as tar:
             for part in parts:
                 tar.add(part, arcname=part.name)
         
-        print(f"✓ Created: {final}")
+        logger.info("✓ Created: %s", final)
         return final
     
     def generate_nested_with_multipart_test(self):
@@ -144,23 +432,23 @@ class TestDataGenerator:
         Generate: nested_with_multipart.tar.gz
         Contains: inner.tar.gz (regular archive) + data.txt multipart (3 parts)
         """
-        print("\n=== Creating nested_with_multipart.tar.gz ===")
+        logger.info("\n=== Creating nested_with_multipart.tar.gz ===")
         
         work = self.work_dir / "nested_with_multipart"
-        work.mkdir()
+        self._ensure_dir(work)
         
         # Create regular nested archive
         inner_content = work / "inner_content"
-        inner_content.mkdir()
-        self.create_text_file(inner_content / "file1.txt", "Hello World\n")
+        self._ensure_dir(inner_content)
+        self.create_text_file(inner_content / "file1.txt", b"Hello World\n")
         
         inner_archive = work / "inner.tar.gz"
         self.create_tar_gz(inner_archive, inner_content)
         
         # Create multipart content
         multipart_content = work / "multipart_content"
-        multipart_content.mkdir()
-        self.create_text_file(multipart_content / "data.txt", "X" * 100)
+        self._ensure_dir(multipart_content)
+        self.create_text_file(multipart_content / "data.txt", _pattern_bytes(b"X", 100))
         
         # Create multipart (3 parts)
         parts = self.create_multipart(
@@ -173,12 +461,12 @@ class TestDataGenerator:
         
         # Package final archive
         final = self.output_dir / "nested_with_multipart.tar.gz"
-        with tarfile.open(final, 'w:gz') as tar:
+        with _open_tar_writer(final) as tar:
             tar.add(inner_archive, arcname="inner.tar.gz")
             for part in parts:
                 tar.add(part, arcname=part.name)
         
-        print(f"✓ Created: {final}")
+        logger.info("✓ Created: %s", final)
         return final
     
     def generate_deeply_nested_test(self):
@@ -187,33 +475,33 @@ class TestDataGenerator:
         5 levels deep: level1 -> level2 -> level3 -> deep.txt
         Also includes multipart at level2
         """
-        print("\n=== Creating deeply_nested.tar.gz ===")
+        logger.info("\n=== Creating deeply_nested.tar.gz ===")
         
         work = self.work_dir / "deeply_nested"
-        work.mkdir()
+        self._ensure_dir(work)
         
         # Level 3 content
         level3_content = work / "level3_content"
-        level3_content.mkdir()
-        self.create_text_file(level3_content / "deep.txt", "deep content\n")
+        self._ensure_dir(level3_content)
+        self.create_text_file(level3_content / "deep.txt", b"deep content\n")
         level3_archive = work / "level3.tar.gz"
         self.create_tar_gz(level3_archive, level3_content)
         
         # Level 2: includes level3 + multipart
         level2_content = work / "level2_content"
-        level2_content.mkdir()
-        shutil.copy(level3_archive, level2_content / "level3.tar.gz")
+        self._ensure_dir(level2_content)
+        _link_or_copy(level3_archive, level2_content / "level3.tar.gz")
         
         # Create multipart at level2
         multipart_content = work / "multipart_at_level2"
-        multipart_content.mkdir()
-        self.create_text_file(multipart_content / "archive_data.txt", "Y" * 150)
+        self._ensure_dir(multipart_content)
+        self.create_text_file(multipart_content / "archive_data.txt", _pattern_bytes(b"Y", 150))
         parts = self.create_multipart(
             level2_content / "archive.tar.gz",
             multipart_content,
             part_size=100,
-            num_parts=2,
-            min_parts=2
+            num_parts=3,
+            min_parts=3
         )
         
         level2_archive = work / "level2.tar.gz"
@@ -221,23 +509,23 @@ class TestDataGenerator:
         
         # Level 1: includes level2 + root file
         level1_content = work / "level1_content"
-        level1_content.mkdir()
-        shutil.copy(level2_archive, level1_content / "level2.tar.gz")
-        self.create_text_file(level1_content / "root.txt", "root data\n")
+        self._ensure_dir(level1_content)
+        _link_or_copy(level2_archive, level1_content / "level2.tar.gz")
+        self.create_text_file(level1_content / "root.txt", b"root data\n")
         
         level1_archive = work / "level1.tar.gz"
         self.create_tar_gz(level1_archive, level1_content)
         
         # Final archive
         final_content = work / "final_content"
-        final_content.mkdir()
-        shutil.copy(level1_archive, final_content / "level1.tar.gz")
-        self.create_text_file(final_content / "root.txt", "top level\n")
+        self._ensure_dir(final_content)
+        _link_or_copy(level1_archive, final_content / "level1.tar.gz")
+        self.create_text_file(final_content / "root.txt", b"top level\n")
         
         final = self.output_dir / "deeply_nested.tar.gz"
         self.create_tar_gz(final, final_content)
         
-        print(f"✓ Created: {final}")
+        logger.info("✓ Created: %s", final)
         return final
     
     def generate_deeply_nested_multipart_test(self):
@@ -246,18 +534,18 @@ class TestDataGenerator:
         Contains: level1.tar multipart (7 parts)
         Inside level1: level3.tar.gz multipart
         """
-        print("\n=== Creating deeply_nested_multipart.tar.gz ===")
+        logger.info("\n=== Creating deeply_nested_multipart.tar.gz ===")
         
         work = self.work_dir / "deeply_nested_multipart"
-        work.mkdir()
+        self._ensure_dir(work)
         
         # Level 3 content - also multipart
         level3_content = work / "level3_content"
-        level3_content.mkdir()
+        self._ensure_dir(level3_content)
         self.create_binary_file(level3_content / "deep_file.dat", 5000)
         
         level3_parts_dir = work / "level3_parts"
-        level3_parts_dir.mkdir()
+        self._ensure_dir(level3_parts_dir)
         level3_parts = self.create_multipart(
             level3_parts_dir / "level3.tar.gz",
             level3_content,
@@ -268,26 +556,28 @@ class TestDataGenerator:
         
         # Level 1 content - includes level3 parts
         level1_content = work / "level1_content"
-        level1_content.mkdir()
+        self._ensure_dir(level1_content)
         for part in level3_parts:
-            shutil.copy(part, level1_content / part.name)
+            _link_or_copy(part, level1_content / part.name)
         
-        # Create level1 as multipart (7 parts of 10KB each)
+        # Create level1 as multipart (7 parts of 10KB each); level1.tar is a plain
+        # tar, and the level3 parts inside it are already gzip-compressed
         parts = self.create_multipart(
             work / "level1.tar",
             level1_content,
             part_size=10240,
             num_parts=7,
-            min_parts=7
+            min_parts=7,
+            compress=False
         )
         
         # Final archive
         final = self.output_dir / "deeply_nested_multipart.tar.gz"
-        with tarfile.open(final, 'w:gz') as tar:
+        with _open_tar_writer(final) as tar:
             for part in parts:
                 tar.add(part, arcname=part.name)
         
-        print(f"✓ Created: {final}")
+        logger.info("✓ Created: %s", final)
         return final
     
     def generate_stress_test_ultimate(self):
@@ -305,20 +595,20 @@ class TestDataGenerator:
         - Level 2: Multiple multipart + deep paths
         - Level 1: Final composition
         """
-        print("\n=== Creating stress_test_ultimate.tar.gz (10-level structure) ===")
+        logger.info("\n=== Creating stress_test_ultimate.tar.gz (10-level structure) ===")
         
         work = self.work_dir / "stress_ultimate"
-        work.mkdir()
+        self._ensure_dir(work)
         
         # ========================================
         # Level 10: Deepest level - Simple files
         # ========================================
-        print("  Level 10: Deepest files")
+        logger.info("  Level 10: Deepest files")
         level10_content = work / "level10_content"
-        level10_content.mkdir()
-        self.create_text_file(level10_content / "deep_file_001.txt", "Deep content 1\n" * 50)
-        self.create_text_file(level10_content / "deep_file_002.txt", "Deep content 2\n" * 100)
-        self.create_text_file(level10_content / "deep_file_003.txt", "Deep content 3\n" * 25)
+        self._ensure_dir(level10_content)
+        self.create_text_file(level10_content / "deep_file_001.txt", _pattern_bytes(b"Deep content 1\n", 50))
+        self.create_text_file(level10_content / "deep_file_002.txt", _pattern_bytes(b"Deep content 2\n", 100))
+        self.create_text_file(level10_content / "deep_file_003.txt", _pattern_bytes(b"Deep content 3\n", 25))
         
         level10_archive = work / "level10_archive.tar.gz"
         self.create_tar_gz(level10_archive, level10_content)
@@ -326,21 +616,21 @@ class TestDataGenerator:
         # ========================================
         # Level 9: Mix of multipart and regular archives
         # ========================================
-        print("  Level 9: Multiple archives in same directory")
+        logger.info("  Level 9: Multiple archives in same directory")
         level9_content = work / "level9_content"
-        level9_content.mkdir()
+        self._ensure_dir(level9_content)
         
         # Small regular archive
         small_content = work / "level9_small"
-        small_content.mkdir()
-        self.create_text_file(small_content / "l9_file_a.txt", "Level 9 A\n" * 30)
-        self.create_text_file(small_content / "l9_file_b.txt", "Level 9 B\n" * 45)
+        self._ensure_dir(small_content)
+        self.create_text_file(small_content / "l9_file_a.txt", _pattern_bytes(b"Level 9 A\n", 30))
+        self.create_text_file(small_content / "l9_file_b.txt", _pattern_bytes(b"Level 9 B\n", 45))
         small_archive = level9_content / "small_archive.tar.gz"
         self.create_tar_gz(small_archive, small_content)
         
         # Multipart at level 9
         multi9_content = work / "level9_multi"
-        multi9_content.mkdir()
+        self._ensure_dir(multi9_content)
         self.create_binary_file(multi9_content / "l9_multipart_content_1.txt", 10000)
         self.create_binary_file(multi9_content / "l9_multipart_content_2.txt", 15000)
         self.create_multipart(
@@ -352,7 +642,7 @@ class TestDataGenerator:
         )
         
         # Include level 10
-        shutil.copy(level10_archive, level9_content / "level10_archive.tar.gz")
+        _link_or_copy(level10_archive, level9_content / "level10_archive.tar.gz")
         
         level9_archive = work / "level9_container.tar.gz"
         self.create_tar_gz(level9_archive, level9_content)
@@ -360,13 +650,13 @@ class TestDataGenerator:
         # ========================================
         # Level 8: Large multipart archive (parts > 65536)
         # ========================================
-        print("  Level 8: Large multipart with big parts")
+        logger.info("  Level 8: Large multipart with big parts")
         level8_content = work / "level8_content"
-        level8_content.mkdir()
+        self._ensure_dir(level8_content)
         
         # Large files for big multipart
         large_content = work / "level8_large"
-        large_content.mkdir()
+        self._ensure_dir(large_content)
         self.create_binary_file(large_content / "large_content_1.txt", 100000)
         self.create_binary_file(large_content / "large_content_2.txt", 150000)
         self.create_binary_file(large_content / "large_content_3.txt", 80000)
@@ -380,7 +670,7 @@ class TestDataGenerator:
         )
         
         # Include level 9
-        shutil.copy(level9_archive, level8_content / "level9_container.tar.gz")
+        _link_or_copy(level9_archive, level8_content / "level9_container.tar.gz")
         
         level8_archive = work / "level8_big_parts.tar.gz"
         self.create_tar_gz(level8_archive, level8_content)
@@ -388,21 +678,21 @@ class TestDataGenerator:
         # ========================================
         # Level 7: Many small archives in same level (12+)
         # ========================================
-        print("  Level 7: Many archives at same level")
+        logger.info("  Level 7: Many archives at same level")
         level7_content = work / "level7_content"
-        level7_content.mkdir()
+        self._ensure_dir(level7_content)
         
         for i in range(1, 13):
             subdir = work / f"level7_subdir_{i:02d}"
-            subdir.mkdir()
-            self.create_text_file(subdir / f"file_{i:02d}_a.txt", f"File {i} A\n" * 10)
-            self.create_text_file(subdir / f"file_{i:02d}_b.txt", f"File {i} B\n" * 15)
+            self._ensure_dir(subdir)
+            self.create_text_file(subdir / f"file_{i:02d}_a.txt", _pattern_bytes(f"File {i} A\n".encode(), 10))
+            self.create_text_file(subdir / f"file_{i:02d}_b.txt", _pattern_bytes(f"File {i} B\n".encode(), 15))
             
             archive = level7_content / f"archive_{i:02d}.tar.gz"
             self.create_tar_gz(archive, subdir)
         
         # Include level 8
-        shutil.copy(level8_archive, level7_content / "level8_big_parts.tar.gz")
+        _link_or_copy(level8_archive, level7_content / "level8_big_parts.tar.gz")
         
         level7_archive = work / "level7_many_archives.tar.gz"
         self.create_tar_gz(level7_archive, level7_content)
@@ -410,13 +700,13 @@ class TestDataGenerator:
         # ========================================
         # Level 6: Multipart with small parts (< 65536)
         # ========================================
-        print("  Level 6: Multipart with small parts")
+        logger.info("  Level 6: Multipart with small parts")
         level6_content = work / "level6_content"
-        level6_content.mkdir()
+        self._ensure_dir(level6_content)
         
         # Small part multipart
         small_part_content = work / "level6_small_part"
-        small_part_content.mkdir()
+        self._ensure_dir(small_part_content)
         self.create_binary_file(small_part_content / "small_part_content.txt", 50000)
         
         self.create_multipart(
@@ -428,7 +718,7 @@ class TestDataGenerator:
         )
         
         # Include level 7
-        shutil.copy(level7_archive, level6_content / "level7_many_archives.tar.gz")
+        _link_or_copy(level7_archive, level6_content / "level7_many_archives.tar.gz")
         
         level6_archive = work / "level6_tiny_parts.tar.gz"
         self.create_tar_gz(level6_archive, level6_content)
@@ -436,13 +726,13 @@ class TestDataGenerator:
         # ========================================
         # Level 5: Nested multipart archives
         # ========================================
-        print("  Level 5: Nested multipart")
+        logger.info("  Level 5: Nested multipart")
         level5_content = work / "level5_content"
-        level5_content.mkdir()
+        self._ensure_dir(level5_content)
         
         # First multipart
         nested_multi_content = work / "level5_nested_multi"
-        nested_multi_content.mkdir()
+        self._ensure_dir(nested_multi_content)
         self.create_binary_file(nested_multi_content / "l5_data_1.txt", 5000)
         self.create_binary_file(nested_multi_content / "l5_data_2.txt", 7000)
         
@@ -456,7 +746,7 @@ class TestDataGenerator:
         
         # Second multipart
         extra_multi_content = work / "level5_extra_multi"
-        extra_multi_content.mkdir()
+        self._ensure_dir(extra_multi_content)
         self.create_binary_file(extra_multi_content / "l5_extra.txt", 3000)
         
         self.create_multipart(
@@ -468,7 +758,7 @@ class TestDataGenerator:
         )
         
         # Include level 6
-        shutil.copy(level6_archive, level5_content / "level6_tiny_parts.tar.gz")
+        _link_or_copy(level6_archive, level5_content / "level6_tiny_parts.tar.gz")
         
         level5_archive = work / "level5_multi_nest.tar.gz"
         self.create_tar_gz(level5_archive, level5_content)
@@ -476,22 +766,22 @@ class TestDataGenerator:
         # ========================================
         # Level 4: Deep directory structure with archives
         # ========================================
-        print("  Level 4: Deep directory paths")
+        logger.info("  Level 4: Deep directory paths")
         level4_content = work / "level4_content"
-        level4_content.mkdir()
+        self._ensure_dir(level4_content)
         
         # Create deep directory structure
         deep_path = level4_content / "very/long/directory/path/structure/that/goes/deep/into/filesystem"
-        deep_path.mkdir(parents=True)
+        self._ensure_dir(deep_path)
         
-        self.create_text_file(deep_path / "deeply_nested_file.txt", "Deep file\n" * 50)
+        self.create_text_file(deep_path / "deeply_nested_file.txt", _pattern_bytes(b"Deep file\n", 50))
         
         # Place archive deep in directory
-        shutil.copy(level5_archive, deep_path / "level5_multi_nest.tar.gz")
+        _link_or_copy(level5_archive, deep_path / "level5_multi_nest.tar.gz")
         
         # Create multipart deep in directory
         deep_multi_content = work / "level4_deep_multi"
-        deep_multi_content.mkdir()
+        self._ensure_dir(deep_multi_content)
         self.create_binary_file(deep_multi_content / "deep_content_1.txt", 8000)
         self.create_binary_file(deep_multi_content / "deep_content_2.txt", 12000)
         
@@ -505,23 +795,20 @@ class TestDataGenerator:
         
         # Create nested archive deep in directory
         deep_nested_content = work / "level4_deep_nested"
-        deep_nested_content.mkdir()
-        self.create_text_file(deep_nested_content / "deep_nested.txt", "Nested\n" * 100)
+        self._ensure_dir(deep_nested_content)
+        self.create_text_file(deep_nested_content / "deep_nested.txt", _pattern_bytes(b"Nested\n", 100))
         deep_nested_archive = deep_path / "deep_nested.tar.gz"
         self.create_tar_gz(deep_nested_archive, deep_nested_content)
         
         # Create deep_dirs.tar.gz from the directory structure
-        deep_dirs_work = work / "level4_deep_dirs_work"
-        deep_dirs_work.mkdir()
-        shutil.copytree(level4_content / "very", deep_dirs_work / "very")
         deep_dirs_archive = work / "deep_dirs.tar.gz"
-        self.create_tar_gz(deep_dirs_archive, deep_dirs_work)
+        self.create_tar_gz_from_path(deep_dirs_archive, level4_content / "very", "very")
         
         # Create level4_deep_paths.tar.gz
         level4_final_content = work / "level4_final_content"
-        level4_final_content.mkdir()
-        shutil.copy(deep_dirs_archive, level4_final_content / "deep_dirs.tar.gz")
-        shutil.copy(level5_archive, level4_final_content / "level5_multi_nest.tar.gz")
+        self._ensure_dir(level4_final_content)
+        _link_or_copy(deep_dirs_archive, level4_final_content / "deep_dirs.tar.gz")
+        _link_or_copy(level5_archive, level4_final_content / "level5_multi_nest.tar.gz")
         
         level4_archive = work / "level4_deep_paths.tar.gz"
         self.create_tar_gz(level4_archive, level4_final_content)
@@ -529,20 +816,20 @@ class TestDataGenerator:
         # ========================================
         # Level 3: Alternating archive and multipart
         # ========================================
-        print("  Level 3: Alternating patterns")
+        logger.info("  Level 3: Alternating patterns")
         level3_content = work / "level3_content"
-        level3_content.mkdir()
+        self._ensure_dir(level3_content)
         
         # Regular archive 1
         regular1_content = work / "level3_regular1"
-        regular1_content.mkdir()
-        self.create_text_file(regular1_content / "regular_1.txt", "Regular 1\n" * 100)
+        self._ensure_dir(regular1_content)
+        self.create_text_file(regular1_content / "regular_1.txt", _pattern_bytes(b"Regular 1\n", 100))
         regular1_archive = level3_content / "regular_archive_1.tar.gz"
         self.create_tar_gz(regular1_archive, regular1_content)
         
         # Multipart 1
         multi1_content = work / "level3_multi1"
-        multi1_content.mkdir()
+        self._ensure_dir(multi1_content)
         self.create_binary_file(multi1_content / "multi_content_1.txt", 8000)
         self.create_multipart(
             level3_content / "alternating_multi_1",
@@ -554,14 +841,14 @@ class TestDataGenerator:
         
         # Regular archive 2
         regular2_content = work / "level3_regular2"
-        regular2_content.mkdir()
-        self.create_text_file(regular2_content / "regular_2.txt", "Regular 2\n" * 150)
+        self._ensure_dir(regular2_content)
+        self.create_text_file(regular2_content / "regular_2.txt", _pattern_bytes(b"Regular 2\n", 150))
         regular2_archive = level3_content / "regular_archive_2.tar.gz"
         self.create_tar_gz(regular2_archive, regular2_content)
         
         # Multipart 2
         multi2_content = work / "level3_multi2"
-        multi2_content.mkdir()
+        self._ensure_dir(multi2_content)
         self.create_binary_file(multi2_content / "multi_content_2.txt", 10000)
         self.create_multipart(
             level3_content / "alternating_multi_2",
@@ -572,7 +859,7 @@ class TestDataGenerator:
         )
         
         # Include level 4
-        shutil.copy(level4_archive, level3_content / "level4_deep_paths.tar.gz")
+        _link_or_copy(level4_archive, level3_content / "level4_deep_paths.tar.gz")
         
         level3_archive = work / "level3_alternating.tar.gz"
         self.create_tar_gz(level3_archive, level3_content)
@@ -580,14 +867,14 @@ class TestDataGenerator:
         # ========================================
         # Level 2: Many multipart archives + deep paths
         # ========================================
-        print("  Level 2: Multiple multipart archives")
+        logger.info("  Level 2: Multiple multipart archives")
         level2_content = work / "level2_content"
-        level2_content.mkdir()
+        self._ensure_dir(level2_content)
         
         # Multiple multipart archives (5 sets)
         for i in range(1, 6):
             multi_content = work / f"level2_multi_set_{i}"
-            multi_content.mkdir()
+            self._ensure_dir(multi_content)
             self.create_binary_file(multi_content / f"multi_set_{i}.txt", 5000 * i)
             
             self.create_multipart(
@@ -600,11 +887,11 @@ class TestDataGenerator:
         
         # Another deep directory pattern
         deep_path2 = level2_content / "another/deep/path/to/test/traversal/capabilities"
-        deep_path2.mkdir(parents=True)
+        self._ensure_dir(deep_path2)
         
         # Multipart deep in path
         path_multi_content = work / "level2_path_multi"
-        path_multi_content.mkdir()
+        self._ensure_dir(path_multi_content)
         self.create_binary_file(path_multi_content / "path_content.txt", 6000)
         
         self.create_multipart(
@@ -617,24 +904,21 @@ class TestDataGenerator:
         
         # Regular archive deep in path
         path_regular_content = work / "level2_path_regular"
-        path_regular_content.mkdir()
-        self.create_text_file(path_regular_content / "path_regular.txt", "Path regular\n" * 200)
+        self._ensure_dir(path_regular_content)
+        self.create_text_file(path_regular_content / "path_regular.txt", _pattern_bytes(b"Path regular\n", 200))
         path_archive = deep_path2 / "path_archive.tar.gz"
         self.create_tar_gz(path_archive, path_regular_content)
         
         # Create deep_path_2.tar.gz from another/ directory
-        deep_path2_work = work / "level2_deep_path2_work"
-        deep_path2_work.mkdir()
-        shutil.copytree(level2_content / "another", deep_path2_work / "another")
         deep_path2_archive = work / "deep_path_2.tar.gz"
-        self.create_tar_gz(deep_path2_archive, deep_path2_work)
+        self.create_tar_gz_from_path(deep_path2_archive, level2_content / "another", "another")
         
         # Remove the another/ directory from level2_content and add the archive
         shutil.rmtree(level2_content / "another")
-        shutil.copy(deep_path2_archive, level2_content / "deep_path_2.tar.gz")
+        _link_or_copy(deep_path2_archive, level2_content / "deep_path_2.tar.gz")
         
         # Include level 3
-        shutil.copy(level3_archive, level2_content / "level3_alternating.tar.gz")
+        _link_or_copy(level3_archive, level2_content / "level3_alternating.tar.gz")
         
         level2_archive = work / "level2_multi_set.tar.gz"
         self.create_tar_gz(level2_archive, level2_content)
@@ -642,34 +926,24 @@ class TestDataGenerator:
         # ========================================
         # Level 1: Top level with everything
         # ========================================
-        print("  Level 1: Final composition")
+        logger.info("  Level 1: Final composition")
         level1_content = work / "level1_content"
-        level1_content.mkdir()
-        
-        # Direct files
-        self.create_text_file(level1_content / "root_file_1.txt", "Root 1\n" * 75)
-        self.create_text_file(level1_content / "root_file_2.txt", "Root 2\n" * 125)
+        self._ensure_dir(level1_content)
         
-        # Root archives
+        # Root archives; the root files are written straight into their archive sources
         root1_content = work / "level1_root1"
-        root1_content.mkdir()
-        shutil.copy(level1_content / "root_file_1.txt", root1_content / "root_file_1.txt")
+        self.create_text_file(root1_content / "root_file_1.txt", _pattern_bytes(b"Root 1\n", 75))
         root1_archive = level1_content / "root_archive_1.tar.gz"
         self.create_tar_gz(root1_archive, root1_content)
         
         root2_content = work / "level1_root2"
-        root2_content.mkdir()
-        shutil.copy(level1_content / "root_file_2.txt", root2_content / "root_file_2.txt")
+        self.create_text_file(root2_content / "root_file_2.txt", _pattern_bytes(b"Root 2\n", 125))
         root2_archive = level1_content / "root_archive_2.tar.gz"
         self.create_tar_gz(root2_archive, root2_content)
         
-        # Remove direct files after creating archives
-        (level1_content / "root_file_1.txt").unlink()
-        (level1_content / "root_file_2.txt").unlink()
-        
         # Root multipart (4 parts)
         root_multi_content = work / "level1_root_multi"
-        root_multi_content.mkdir()
+        self._ensure_dir(root_multi_content)
         self.create_binary_file(root_multi_content / "root_multi_content.txt", 20000)
         
         self.create_multipart(
@@ -681,7 +955,7 @@ class TestDataGenerator:
         )
         
         # Include level 2
-        shutil.copy(level2_archive, level1_content / "level2_multi_set.tar.gz")
+        _link_or_copy(level2_archive, level1_content / "level2_multi_set.tar.gz")
         
         level1_archive = work / "level1_final.tar.gz"
         self.create_tar_gz(level1_archive, level1_content)
@@ -689,18 +963,18 @@ class TestDataGenerator:
         # ========================================
         # Ultimate level: Final stress test
         # ========================================
-        print("  Ultimate: Creating final stress test archive")
+        logger.info("  Ultimate: Creating final stress test archive")
         ultimate_content = work / "ultimate_content"
-        ultimate_content.mkdir()
+        self._ensure_dir(ultimate_content)
         
         # Include level 1
-        shutil.copy(level1_archive, ultimate_content / "level1_final.tar.gz")
+        _link_or_copy(level1_archive, ultimate_content / "level1_final.tar.gz")
         
         # Add extra archives (8)
         for i in range(1, 9):
             extra_content = work / f"ultimate_extra_{i}"
-            extra_content.mkdir()
-            self.create_text_file(extra_content / f"extra_file_{i}.txt", f"Extra {i}\n" * (1000 * i // 10))
+            self._ensure_dir(extra_content)
+            self.create_text_file(extra_content / f"extra_file_{i}.txt", _pattern_bytes(f"Extra {i}\n".encode(), 1000 * i // 10))
             
             extra_archive = ultimate_content / f"extra_archive_{i}.tar.gz"
             self.create_tar_gz(extra_archive, extra_content)
@@ -708,7 +982,7 @@ class TestDataGenerator:
         # Ultimate multipart archives (3 sets, 4 parts each)
         for i in range(1, 4):
             ultimate_multi_content = work / f"ultimate_multi_{i}"
-            ultimate_multi_content.mkdir()
+            self._ensure_dir(ultimate_multi_content)
             self.create_binary_file(ultimate_multi_content / f"ultimate_multi_{i}.txt", 15000 * i)
             
             self.create_multipart(
@@ -723,17 +997,17 @@ class TestDataGenerator:
         final = self.output_dir / "stress_test_ultimate.tar.gz"
         self.create_tar_gz(final, ultimate_content)
         
-        print(f"✓ Created: {final}")
-        print(f"  Structure: 10+ levels of nesting")
-        print(f"  Archives: 30+ total")
-        print(f"  Multipart sets: 15+ with various part sizes")
+        logger.info("✓ Created: %s", final)
+        logger.info("  Structure: 10+ levels of nesting")
+        logger.info("  Archives: 30+ total")
+        logger.info("  Multipart sets: 15+ with various part sizes")
         return final
     
     def generate_all(self):
         """Generate all test data files"""
-        print("=" * 60)
-        print("Archive_r Test Data Generator")
-        print("=" * 60)
+        logger.info("=" * 60)
+        logger.info("Archive_r Test Data Generator")
+        logger.info("=" * 60)
         
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
@@ -745,17 +1019,19 @@ class TestDataGenerator:
             self.generate_stress_test_ultimate(),
         ]
         
-        print("\n" + "=" * 60)
-        print("Summary:")
-        print("=" * 60)
+        logger.info("\n" + "=" * 60)
+        logger.info("Summary:")
+        logger.info("=" * 60)
         for archive in archives:
             size = archive.stat().st_size
-            print(f"  {archive.name:40s} {size:8d} bytes")
+            logger.info("  %-40s %8d bytes", archive.name, size)
         
-        print("\n✓ All test data generated successfully!")
+        logger.info("\n✓ All test data generated successfully!")
 
 
 def main():
+    # Per-file progress is logged at DEBUG; only the section banners show by default
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
     script_dir = Path(__file__).parent
     output_dir = script_dir
     